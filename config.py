@@ -3,38 +3,138 @@ Configuration file for the AEye project.
 Contains all API keys, configuration values, and environment variables.
 """
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """
+    Immutable, typed snapshot of the AEye configuration.
+    """
+
+    # Google Cloud Speech-to-Text API Key
+    GOOGLE_CLOUD_CREDENTIALS_PATH: str
+
+    # Google Generative AI API Key
+    GEMINI_API_KEY: str
+
+    # Groq API Key
+    GROQ_API_KEY: str
+
+    # Twilio Configuration
+    TWILIO_ACCOUNT_SID: str
+    TWILIO_AUTH_TOKEN: str
+    TWILIO_PHONE_NUMBER: str
+    EMERGENCY_PHONE_NUMBER: str
+
+    # ESP32 Configuration
+    ESP32_CAM_URL: str
+    ESP32_SERVO_URL: str
+
+    # Camera Configuration
+    CAMERA_INDEX: int
+    CAMERA_FRAME_WIDTH: int
+    CAMERA_FRAME_HEIGHT: int
+    RECORDING_DURATION: int
+    SAMPLE_RATE: int
+
+    # Face Recognition Configuration
+    FACE_OUTPUT_DIR: str
+    FACE_DETECTION_SCALE_FACTOR: float
+    FACE_DETECTION_MIN_NEIGHBORS: int
+    FACE_DETECTION_MIN_SIZE: int
+    FACE_DETECTION_MAX_WIDTH: int
+    FACE_DETECTION_MODEL_PATH: str
+
+    # Document Analysis (ChromaDB HNSW index) Configuration
+    CHROMA_HNSW_SPACE: str
+    CHROMA_HNSW_M: int
+    CHROMA_HNSW_EF_CONSTRUCTION: int
+    CHROMA_HNSW_SEARCH_EF: int
+
+
+@lru_cache(maxsize=1)
+def load_config():
+    """
+    Loads the configuration once from the environment and the .env file.
+
+    Returns:
+        Config: Cached configuration instance
+    """
+    # Load environment variables from .env file
+    load_dotenv()
+    env = os.environ.copy()
+
+    return Config(
+        GOOGLE_CLOUD_CREDENTIALS_PATH=env.get("GOOGLE_CLOUD_CREDENTIALS_PATH", "modules/elated-yen-446113-a9-e3c6f3910fa2.json"),
+        GEMINI_API_KEY=env.get("GEMINI_API_KEY", "Enter Gemini API Key here"),
+        GROQ_API_KEY=env.get("GROQ_API_KEY", "Enter GROQ API Key here"),
+        TWILIO_ACCOUNT_SID=env.get("TWILIO_ACCOUNT_SID", "Enter TWILIO_ACCOUNT_SID here"),
+        TWILIO_AUTH_TOKEN=env.get("TWILIO_AUTH_TOKEN", "Enter TWILIO_AUTH_TOKEN here"),
+        TWILIO_PHONE_NUMBER=env.get("TWILIO_PHONE_NUMBER", "Enter TWILIO_PHONE_NUMBER here"),
+        EMERGENCY_PHONE_NUMBER=env.get("EMERGENCY_PHONE_NUMBER", "Enter EMERGENCY_PHONE_NUMBER here"),
+        ESP32_CAM_URL=env.get("ESP32_CAM_URL", "http://192.168.168.232/cam-hi.jpg"),
+        ESP32_SERVO_URL=env.get("ESP32_SERVO_URL", "http://192.168.168.193"),
+        CAMERA_INDEX=int(env.get("CAMERA_INDEX", "0")),
+        CAMERA_FRAME_WIDTH=int(env.get("CAMERA_FRAME_WIDTH", "640")),
+        CAMERA_FRAME_HEIGHT=int(env.get("CAMERA_FRAME_HEIGHT", "480")),
+        RECORDING_DURATION=int(env.get("RECORDING_DURATION", "5")),
+        SAMPLE_RATE=int(env.get("SAMPLE_RATE", "16000")),
+        FACE_OUTPUT_DIR=env.get("FACE_OUTPUT_DIR", "known_image"),
+        FACE_DETECTION_SCALE_FACTOR=float(env.get("FACE_DETECTION_SCALE_FACTOR", "1.2")),
+        FACE_DETECTION_MIN_NEIGHBORS=int(env.get("FACE_DETECTION_MIN_NEIGHBORS", "6")),
+        FACE_DETECTION_MIN_SIZE=int(env.get("FACE_DETECTION_MIN_SIZE", "40")),
+        FACE_DETECTION_MAX_WIDTH=int(env.get("FACE_DETECTION_MAX_WIDTH", "480")),
+        FACE_DETECTION_MODEL_PATH=env.get("FACE_DETECTION_MODEL_PATH", "modules/face_detection_yunet_2023mar_int8.onnx"),
+        CHROMA_HNSW_SPACE=env.get("CHROMA_HNSW_SPACE", "cosine"),
+        CHROMA_HNSW_M=int(env.get("CHROMA_HNSW_M", "16")),
+        CHROMA_HNSW_EF_CONSTRUCTION=int(env.get("CHROMA_HNSW_EF_CONSTRUCTION", "200")),
+        CHROMA_HNSW_SEARCH_EF=int(env.get("CHROMA_HNSW_SEARCH_EF", "32")),
+    )
+
+
+CONFIG = load_config()
+
+# Module-level names kept for backward compatibility with existing imports
 
 # Google Cloud Speech-to-Text API Key
-GOOGLE_CLOUD_CREDENTIALS_PATH = os.getenv("GOOGLE_CLOUD_CREDENTIALS_PATH", "modules/elated-yen-446113-a9-e3c6f3910fa2.json")
+GOOGLE_CLOUD_CREDENTIALS_PATH = CONFIG.GOOGLE_CLOUD_CREDENTIALS_PATH
 
 # Google Generative AI API Key
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "Enter Gemini API Key here")
+GEMINI_API_KEY = CONFIG.GEMINI_API_KEY
 
 # Groq API Key
-GROQ_API_KEY = os.getenv("GROQ_API_KEY", "Enter GROQ API Key here")
+GROQ_API_KEY = CONFIG.GROQ_API_KEY
 
 # Twilio Configuration
-TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID", "Enter TWILIO_ACCOUNT_SID here")
-TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN", "Enter TWILIO_AUTH_TOKEN here")
-TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER", "Enter TWILIO_PHONE_NUMBER here")
-EMERGENCY_PHONE_NUMBER = os.getenv("EMERGENCY_PHONE_NUMBER", "Enter EMERGENCY_PHONE_NUMBER here")
+TWILIO_ACCOUNT_SID = CONFIG.TWILIO_ACCOUNT_SID
+TWILIO_AUTH_TOKEN = CONFIG.TWILIO_AUTH_TOKEN
+TWILIO_PHONE_NUMBER = CONFIG.TWILIO_PHONE_NUMBER
+EMERGENCY_PHONE_NUMBER = CONFIG.EMERGENCY_PHONE_NUMBER
 
 # ESP32 Configuration
-ESP32_CAM_URL = os.getenv("ESP32_CAM_URL", "http://192.168.168.232/cam-hi.jpg")
-ESP32_SERVO_URL = os.getenv("ESP32_SERVO_URL", "http://192.168.168.193")
+ESP32_CAM_URL = CONFIG.ESP32_CAM_URL
+ESP32_SERVO_URL = CONFIG.ESP32_SERVO_URL
 
 # Camera Configuration
-CAMERA_INDEX = int(os.getenv("CAMERA_INDEX", "0"))
-RECORDING_DURATION = int(os.getenv("RECORDING_DURATION", "5"))
-SAMPLE_RATE = int(os.getenv("SAMPLE_RATE", "16000"))
+CAMERA_INDEX = CONFIG.CAMERA_INDEX
+CAMERA_FRAME_WIDTH = CONFIG.CAMERA_FRAME_WIDTH
+CAMERA_FRAME_HEIGHT = CONFIG.CAMERA_FRAME_HEIGHT
+RECORDING_DURATION = CONFIG.RECORDING_DURATION
+SAMPLE_RATE = CONFIG.SAMPLE_RATE
 
 # Face Recognition Configuration
-FACE_OUTPUT_DIR = os.getenv("FACE_OUTPUT_DIR", "known_image")
-FACE_DETECTION_SCALE_FACTOR = float(os.getenv("FACE_DETECTION_SCALE_FACTOR", "1.2"))
-FACE_DETECTION_MIN_NEIGHBORS = int(os.getenv("FACE_DETECTION_MIN_NEIGHBORS", "6"))
-FACE_DETECTION_MIN_SIZE = int(os.getenv("FACE_DETECTION_MIN_SIZE", "40"))
+FACE_OUTPUT_DIR = CONFIG.FACE_OUTPUT_DIR
+FACE_DETECTION_SCALE_FACTOR = CONFIG.FACE_DETECTION_SCALE_FACTOR
+FACE_DETECTION_MIN_NEIGHBORS = CONFIG.FACE_DETECTION_MIN_NEIGHBORS
+FACE_DETECTION_MIN_SIZE = CONFIG.FACE_DETECTION_MIN_SIZE
+FACE_DETECTION_MAX_WIDTH = CONFIG.FACE_DETECTION_MAX_WIDTH
+FACE_DETECTION_MODEL_PATH = CONFIG.FACE_DETECTION_MODEL_PATH
 
+# Document Analysis (ChromaDB HNSW index) Configuration
+CHROMA_HNSW_SPACE = CONFIG.CHROMA_HNSW_SPACE
+CHROMA_HNSW_M = CONFIG.CHROMA_HNSW_M
+CHROMA_HNSW_EF_CONSTRUCTION = CONFIG.CHROMA_HNSW_EF_CONSTRUCTION
+CHROMA_HNSW_SEARCH_EF = CONFIG.CHROMA_HNSW_SEARCH_EF
@@ -3,6 +3,7 @@ Main Application Module
 Main entry point for the AI Eye Assistant application.
 """
 
+import re
 from modules.speech_manager import get_voice_input, speak_text
 from modules.scene_analyzer import analyze_scene
 from modules.object_recognizer import recognize_object, handle_follow_up_queries
@@ -10,7 +11,143 @@ from modules.text_extractor import extract_text_from_image
 from modules.emergency_handler import send_sos_message
 from modules.face_recognition import register_new_face
 from modules.navigation_assistant import analyze_environment
-from modules.iot_controller import set_servo_angle
+from modules.iot_controller import aim_camera
+
+# Trigger words for each voice command category, matched as whole words (list inflections explicitly)
+TRIGGERS = {
+    "scene": ["scene", "describe", "describing", "description", "seeing", "see"],
+    "sensory": ["sensory", "search", "searching", "holding", "buy"],
+    "ocr": ["read", "reading", "book", "notice", "pamphlet"],
+    "sos": ["sos", "emergency", "help"],
+    "face": ["face", "faces", "recognize", "register"],
+    "nav": ["navigation", "route", "navigate", "path", "show me route", "show me"],
+}
+
+# Category dispatched when an utterance mentions several, highest priority first
+TRIGGER_PRIORITY = ["sos", "face", "ocr", "sensory", "nav", "scene"]
+
+
+def build_trigger_pattern(triggers):
+    """
+    Compiles all trigger words into a single alternation with one named group per category.
+    
+    Args:
+        triggers (dict): Mapping of category name to its trigger words
+    
+    Returns:
+        re.Pattern: Compiled case-insensitive pattern
+    """
+    groups = []
+    for category, words in triggers.items():
+        # Longer words first so "show me route" wins over "show me"
+        alternatives = "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+        # Whole words only, so "helpful" never sends an SOS
+        groups.append(f"(?P<{category}>\\b(?:{alternatives})\\b)")
+    return re.compile("|".join(groups), re.IGNORECASE)
+
+
+TRIGGER_PATTERN = build_trigger_pattern(TRIGGERS)
+
+
+def match_trigger(user_talk):
+    """
+    Finds the trigger category mentioned in an utterance in a single regex pass.
+    When several categories are mentioned, the one highest in TRIGGER_PRIORITY wins,
+    so "I can't see anything, help" dispatches SOS rather than a scene description.
+    
+    Args:
+        user_talk (str): Transcribed user utterance
+    
+    Returns:
+        str: Name of the highest-priority matched trigger category or None if nothing matched
+    
+    Examples:
+        >>> match_trigger("I can't see anything, help")
+        'sos'
+        >>> match_trigger("describe the scene, that'd be helpful")
+        'scene'
+    """
+    matched = {match.lastgroup for match in TRIGGER_PATTERN.finditer(user_talk)}
+    for category in TRIGGER_PRIORITY:
+        if category in matched:
+            return category
+    return None
+
+
+def handle_scene_command():
+    """
+    Describes the current scene.
+    """
+    scene_description = analyze_scene()
+    if scene_description:
+        speak_text(scene_description)
+    else:
+        speak_text("Failed to analyze scene")
+
+
+def handle_sensory_command():
+    """
+    Recognizes the held object and starts a follow-up session.
+    """
+    object_info = recognize_object()
+    if object_info:
+        handle_follow_up_queries(object_info)
+    else:
+        speak_text("Failed to recognize object")
+
+
+def handle_ocr_command():
+    """
+    Reads out the text in front of the camera.
+    """
+    aim_camera(115)
+    extracted_text = extract_text_from_image()
+    if not extracted_text:
+        speak_text("Failed to extract text from image")
+
+
+def handle_sos_command():
+    """
+    Sends an emergency SOS message.
+    """
+    result = send_sos_message()
+    print(f"SOS Result: {result}")
+    if "SID" in str(result):
+        speak_text("SOS message sent successfully")
+    else:
+        speak_text("Failed to send SOS message")
+
+
+def handle_nav_command():
+    """
+    Analyzes the environment for navigation.
+    """
+    navigation_info = analyze_environment()
+    if not navigation_info:
+        speak_text("Failed to analyze environment for navigation")
+
+
+def handle_face_command():
+    """
+    Registers the face in front of the camera.
+    """
+    aim_camera(90)
+    detected_name = register_new_face()
+    if detected_name:
+        speak_text(f"Face registered as {detected_name}")
+    else:
+        speak_text("Face registration failed.")
+
+
+# Dispatch table from trigger category to its handler
+COMMAND_HANDLERS = {
+    "scene": handle_scene_command,
+    "sensory": handle_sensory_command,
+    "ocr": handle_ocr_command,
+    "sos": handle_sos_command,
+    "nav": handle_nav_command,
+    "face": handle_face_command,
+}
 
 
 def start():
@@ -26,62 +163,10 @@ def start():
             print(user_talk)  # Now returns text
             
             if user_talk:  # Ensure input is valid
-                # Define trigger words for different functions
-                scene_trigger = ["scene", "describe", "description", "seeing", "see"]
-                sensory_trigger = ["sensory", "search", "holding", "buy"]
-                ocr_trigger = ["read", "book", "notice", "pamphlet"]
-                sos_trigger = ["sos", "emergency", "help"]
-                face_trigger = ["face", "recognize", "register"]
-                nav_trigger = ["navigation", "route", "navigate", "path", "show me route", "show me"]
-                
-                # Scene description trigger
-                if any(word in user_talk for word in scene_trigger):
-                    set_servo_angle(115)
-                    scene_description = analyze_scene()
-                    if scene_description:
-                        speak_text(scene_description)
-                    else:
-                        speak_text("Failed to analyze scene")
-                
-                # Object recognition trigger
-                if any(word in user_talk for word in sensory_trigger):
-                    object_info = recognize_object()
-                    if object_info:
-                        handle_follow_up_queries(object_info)
-                    else:
-                        speak_text("Failed to recognize object")
-                
-                # Text extraction trigger
-                if any(word in user_talk for word in ocr_trigger):
-                    set_servo_angle(115)
-                    extracted_text = extract_text_from_image()
-                    if not extracted_text:
-                        speak_text("Failed to extract text from image")
-                
-                # Emergency SOS trigger
-                if any(word in user_talk for word in sos_trigger):
-                    result = send_sos_message()
-                    print(f"SOS Result: {result}")
-                    if "SID" in str(result):
-                        speak_text("SOS message sent successfully")
-                    else:
-                        speak_text("Failed to send SOS message")
-                
-                # Navigation trigger
-                if any(word in user_talk for word in nav_trigger):
-                    set_servo_angle(90)
-                    navigation_info = analyze_environment()
-                    if not navigation_info:
-                        speak_text("Failed to analyze environment for navigation")
-                
-                # Face recognition trigger
-                if any(word in user_talk for word in face_trigger):
-                    set_servo_angle(90)
-                    detected_name = register_new_face()
-                    if detected_name:
-                        speak_text(f"Face registered as {detected_name}")
-                    else:
-                        speak_text("Face registration failed.")
+                # Dispatch the highest-priority triggered function only
+                category = match_trigger(user_talk)
+                if category:
+                    COMMAND_HANDLERS[category]()
                 
                 # Exit command
                 if "exit" in user_talk:
@@ -3,18 +3,74 @@ Document Analyzer Module
 Provides RAG (Retrieval-Augmented Generation) capabilities for document analysis and Q&A.
 """
 
+import atexit
 import os
-import re
 from datetime import datetime
+from functools import lru_cache
 from typing import List
 import chromadb
 import google.generativeai as genai
 from chromadb import Documents, EmbeddingFunction, Embeddings
 from pypdf import PdfReader
-from config import GEMINI_API_KEY
 
-# Configure Gemini API
-genai.configure(api_key=GEMINI_API_KEY)
+# PyMuPDF extracts text through a C backend; pypdf is the fallback
+try:
+    import fitz
+except ImportError:
+    fitz = None
+from config import (
+    CHROMA_HNSW_SPACE,
+    CHROMA_HNSW_M,
+    CHROMA_HNSW_EF_CONSTRUCTION,
+    CHROMA_HNSW_SEARCH_EF
+)
+from modules.gemini_client import RAG_MODEL
+
+# Maximum number of documents sent per embedding / insert request
+EMBEDDING_BATCH_SIZE = 100
+
+# HNSW index parameters applied when a collection is created
+HNSW_METADATA = {
+    "hnsw:space": CHROMA_HNSW_SPACE,
+    "hnsw:M": CHROMA_HNSW_M,
+    "hnsw:construction_ef": CHROMA_HNSW_EF_CONSTRUCTION,
+    "hnsw:search_ef": CHROMA_HNSW_SEARCH_EF,
+}
+
+# Strips quotes and flattens newlines in a single pass over the passage
+PASSAGE_ESCAPE_TABLE = str.maketrans({"'": "", '"': "", "\n": " "})
+
+# RAG prompt, built once; only the query and passage are substituted per call
+RAG_PROMPT_TEMPLATE = """You are a helpful, friendly, and conversational assistant that answers questions 
+using the reference passage provided below. Your responses should be clear, accessible, 
+and engaging, especially for a non-technical audience. Break down complex concepts into 
+simple terms, using relatable examples where appropriate, and avoid unnecessary jargon. 
+Be concise when possible, but ensure your answers are comprehensive and provide all the 
+necessary context to fully address the question. If the reference passage does not directly 
+relate to the question, you may ignore it or supplement your answer with general knowledge.
+
+QUESTION: '{query}' 
+PASSAGE: '{escaped}' 
+
+ANSWER:"""
+
+
+@lru_cache(maxsize=8)
+def get_chroma_client(path):
+    """
+    Returns the ChromaDB client for a path, opening it once per process.
+    
+    Args:
+        path (str): Path to the database
+        
+    Returns:
+        chromadb.PersistentClient: Shared client for the path
+    """
+    return chromadb.PersistentClient(path=path)
+
+
+# Drop cached clients on shutdown so their resources are released
+atexit.register(get_chroma_client.cache_clear)
 
 
 class GeminiEmbeddingFunction(EmbeddingFunction):
@@ -35,13 +91,17 @@ class GeminiEmbeddingFunction(EmbeddingFunction):
         try:
             model = "models/embedding-001"
             title = "Custom query"
-            embeddings = genai.embed_content(
-                model=model,
-                content=input,
-                task_type="retrieval_document",
-                title=title
-            )
-            return embeddings["embedding"]
+            embeddings = []
+            # Slice into batches to respect Gemini's per-request limits
+            for start in range(0, len(input), EMBEDDING_BATCH_SIZE):
+                batch = genai.embed_content(
+                    model=model,
+                    content=input[start:start + EMBEDDING_BATCH_SIZE],
+                    task_type="retrieval_document",
+                    title=title
+                )
+                embeddings.extend(batch["embedding"])
+            return embeddings
         except Exception as e:
             print(f"Error generating embeddings: {e}")
             return []
@@ -58,11 +118,13 @@ def load_pdf(file_path):
         str: Extracted text content
     """
     try:
+        if fitz is not None:
+            with fitz.open(file_path) as doc:
+                return "".join(page.get_text("text") for page in doc)
+        
         reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
-        return text
+        # Pages without a text layer yield None
+        return "".join(page.extract_text() or "" for page in reader.pages)
     except Exception as e:
         print(f"Error loading PDF: {e}")
         return ""
@@ -79,7 +141,8 @@ def split_text(text: str):
         List[str]: List of text chunks
     """
     try:
-        split_text_chunks = re.split(r'(\n \n)', text)
+        # The delimiter is a plain literal, so str.split avoids the regex engine
+        split_text_chunks = text.split("\n \n")
         return [chunk for chunk in split_text_chunks if chunk != ""]
     except Exception as e:
         print(f"Error splitting text: {e}")
@@ -99,14 +162,29 @@ def create_chroma_db(documents: List, path: str):
     """
     try:
         name = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        chroma_client = chromadb.PersistentClient(path=path)
+        embedding_function = GeminiEmbeddingFunction()
+
+        # Embed every document up front so Chroma skips its internal embedding path
+        embeddings = embedding_function(documents)
+        if len(embeddings) != len(documents):
+            print("Error creating ChromaDB: failed to embed all documents")
+            return None, None
+
+        chroma_client = get_chroma_client(path)
+        # The embedding function stays registered for query-time embedding
         db = chroma_client.create_collection(
-            name=name, 
-            embedding_function=GeminiEmbeddingFunction()
+            name=name,
+            embedding_function=embedding_function,
+            metadata=HNSW_METADATA
         )
 
-        for i, doc in enumerate(documents):
-            db.add(documents=[doc], ids=[str(i)])
+        for start in range(0, len(documents), EMBEDDING_BATCH_SIZE):
+            end = start + EMBEDDING_BATCH_SIZE
+            db.add(
+                documents=documents[start:end],
+                embeddings=embeddings[start:end],
+                ids=[str(i) for i in range(start, min(end, len(documents)))]
+            )
 
         return db, name
     except Exception as e:
@@ -126,7 +204,7 @@ def load_chroma_collection(path, name):
         Collection: Loaded ChromaDB collection
     """
     try:
-        chroma_client = chromadb.PersistentClient(path=path)
+        chroma_client = get_chroma_client(path)
         return chroma_client.get_collection(
             name=name, 
             embedding_function=GeminiEmbeddingFunction()
@@ -168,21 +246,8 @@ def make_rag_prompt(query, relevant_passage):
         str: Formatted prompt for the AI model
     """
     try:
-        escaped = relevant_passage.replace("'", "").replace('"', "").replace("\n", " ")
-        prompt = (
-            """You are a helpful, friendly, and conversational assistant that answers questions 
-            using the reference passage provided below. Your responses should be clear, accessible, 
-            and engaging, especially for a non-technical audience. Break down complex concepts into 
-            simple terms, using relatable examples where appropriate, and avoid unnecessary jargon. 
-            Be concise when possible, but ensure your answers are comprehensive and provide all the 
-            necessary context to fully address the question. If the reference passage does not directly 
-            relate to the question, you may ignore it or supplement your answer with general knowledge.
-            
-            QUESTION: '{query}' 
-            PASSAGE: '{escaped}' 
-            
-            ANSWER:"""
-        ).format(query=query, escaped=escaped)
+        escaped = relevant_passage.translate(PASSAGE_ESCAPE_TABLE)
+        prompt = RAG_PROMPT_TEMPLATE.format(query=query, escaped=escaped)
 
         return prompt
     except Exception as e:
@@ -201,8 +266,7 @@ def generate_gemini_answer(prompt):
         str: Generated answer
     """
     try:
-        model = genai.GenerativeModel('gemini-pro')
-        answer = model.generate_content(prompt)
+        answer = RAG_MODEL.generate_content(prompt)
         return answer.text
     except Exception as e:
         print(f"Error generating answer: {e}")
@@ -221,7 +285,7 @@ def generate_answer(db, query):
         str: Generated answer
     """
     try:
-        relevant_text = get_relevant_passage(db, query, n_results=3)
+        relevant_text = get_relevant_passage(query, db, n_results=3)
         if not relevant_text:
             return "I couldn't find relevant information to answer your question."
         
@@ -232,6 +296,48 @@ def generate_answer(db, query):
         return "Sorry, I encountered an error while processing your question."
 
 
+def generate_answers_batch(db, queries):
+    """
+    Generates answers for several queries using a single batched database lookup.
+    
+    Args:
+        db: ChromaDB collection
+        queries (List[str]): User's questions
+        
+    Returns:
+        List[str]: Generated answers, in the same order as the queries
+    """
+    try:
+        # One query call embeds and searches for every question at once
+        results = db.query(query_texts=queries, n_results=3)['documents']
+        
+        answers = []
+        for query, relevant_text in zip(queries, results):
+            if not relevant_text:
+                answers.append("I couldn't find relevant information to answer your question.")
+                continue
+            prompt = make_rag_prompt(query, relevant_passage="".join(relevant_text))
+            answers.append(generate_gemini_answer(prompt))
+        return answers
+    except Exception as e:
+        print(f"Error generating answers: {e}")
+        return ["Sorry, I encountered an error while processing your question."] * len(queries)
+
+
+def split_questions(text):
+    """
+    Splits pasted input containing several questions into individual questions.
+    
+    Args:
+        text (str): Raw user input
+        
+    Returns:
+        List[str]: Individual questions
+    """
+    questions = [q.strip() for q in text.replace("?", "?\n").splitlines()]
+    return [q for q in questions if q]
+
+
 def analyze_document(file_path, output_path="document_analysis"):
     """
     Analyzes a document and creates a searchable database.
@@ -283,6 +389,14 @@ def interactive_document_qa(db):
                 print("Please enter a question.")
                 continue
             
+            # Answer pasted multi-question input with one batched lookup
+            questions = split_questions(query)
+            if len(questions) > 1:
+                answers = generate_answers_batch(db, questions)
+                for question, answer in zip(questions, answers):
+                    print(f"\nQuestion: {question}\nAnswer: {answer}")
+                continue
+            
             # Generate answer
             answer = generate_answer(db, query)
             print(f"\nAnswer: {answer}")
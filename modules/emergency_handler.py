@@ -3,6 +3,9 @@ Emergency Handler Module
 Handles emergency situations by sending SOS messages with location information.
 """
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from twilio.rest import Client
 import requests
 from config import (
@@ -12,16 +15,57 @@ from config import (
     EMERGENCY_PHONE_NUMBER
 )
 
+# How long a looked-up location stays valid, in seconds
+LOCATION_CACHE_TTL = 300
 
-def get_location():
+# Last successful location lookup, keyed on a monotonic timestamp
+_LOCATION_CACHE = {"t": 0.0, "v": None}
+
+# Shared HTTP session so repeated lookups reuse the TCP/TLS connection
+_SESSION = requests.Session()
+
+# Twilio client shared across calls, created on first use
+_CLIENT = None
+
+# Longest the SOS path waits for a location before sending without one
+SOS_LOCATION_TIMEOUT = 5
+
+# Workers for overlapping independent I/O on the SOS path
+_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+
+def get_client():
+    """
+    Returns the shared Twilio client, creating it on first use.
+    
+    Returns:
+        Client: Twilio REST client
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+    return _CLIENT
+
+
+def get_location(force=False):
     """
     Retrieves current location information using IP geolocation.
+    Results are cached for LOCATION_CACHE_TTL seconds to keep the SOS path fast,
+    and the last known location is returned if a lookup fails.
+    
+    Args:
+        force (bool): Always query the service and report a failed lookup instead of
+            falling back to the last known location; the cache is kept either way
     
     Returns:
         str: Formatted location string with coordinates and Google Maps link
     """
+    if (not force and _LOCATION_CACHE["v"]
+            and time.monotonic() - _LOCATION_CACHE["t"] < LOCATION_CACHE_TTL):
+        return _LOCATION_CACHE["v"]
+    
     try:
-        response = requests.get("https://ipinfo.io/json", timeout=10)
+        response = _SESSION.get("https://ipinfo.io/json", timeout=10)
         data = response.json()
         
         location = data.get("loc", "Unknown location")  # lat,long
@@ -35,11 +79,24 @@ def get_location():
             maps_link = f"https://www.google.com/maps?q={location}"
         
         location_info = f"{city}, {region}, {country}\n📍 Location: {location}\n🔗 Google Maps: {maps_link}"
+        _LOCATION_CACHE["t"] = time.monotonic()
+        _LOCATION_CACHE["v"] = location_info
         return location_info
         
     except Exception as e:
         print(f"Error getting location: {e}")
-        return "Location unavailable"
+        if force:
+            return "Location unavailable"
+        # A stale location is still more useful than none
+        return _LOCATION_CACHE["v"] or "Location unavailable"
+
+
+def refresh_location():
+    """
+    Refreshes the cached location in a background thread.
+    The cached location stays valid until the new lookup succeeds.
+    """
+    threading.Thread(target=get_location, kwargs={"force": True}, daemon=True).start()
 
 
 def send_sos_message():
@@ -50,11 +107,18 @@ def send_sos_message():
         str: Message SID if successful, error message if failed
     """
     try:
-        # Initialize Twilio client
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+        # Start the location lookup while the Twilio client is prepared
+        location_future = _EXECUTOR.submit(get_location)
         
-        # Get current location
-        location = get_location()
+        # Get the shared Twilio client
+        client = get_client()
+        
+        # Get current location, but never hold up the emergency for it
+        try:
+            location = location_future.result(timeout=SOS_LOCATION_TIMEOUT)
+        except TimeoutError:
+            print("Location lookup timed out, sending SOS with the last known location.")
+            location = _LOCATION_CACHE["v"] or "Location unavailable"
         
         # Compose emergency message
         message_body = f"🚨 SOS Alert 🚨\nPlease send help!\nLocation: {location}"
@@ -67,6 +131,9 @@ def send_sos_message():
         )
         
         print(f"SOS message sent successfully. SID: {message.sid}")
+        
+        # Keep the cached location current for any follow-up alerts
+        refresh_location()
         return message.sid
         
     except Exception as e:
@@ -86,8 +153,8 @@ def send_custom_emergency_message(custom_message):
         str: Message SID if successful, error message if failed
     """
     try:
-        # Initialize Twilio client
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+        # Get the shared Twilio client
+        client = get_client()
         
         # Get current location
         location = get_location()
@@ -143,12 +210,12 @@ def test_emergency_system():
     }
     
     try:
-        # Test location service
-        location = get_location()
+        # Test location service with a live lookup, not the cache
+        location = get_location(force=True)
         test_results['location_service'] = location != "Location unavailable"
         
         # Test Twilio connection
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+        client = get_client()
         # Try to fetch account info to test connection
         account = client.api.accounts(TWILIO_ACCOUNT_SID).fetch()
         test_results['twilio_connection'] = account is not None
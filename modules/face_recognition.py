@@ -3,15 +3,21 @@ Face Recognition Module
 Handles face detection, recognition, and registration using OpenCV.
 """
 
+import atexit
 import cv2
 import os
+import queue
+import threading
 import time
 from config import (
     FACE_OUTPUT_DIR, 
     FACE_DETECTION_SCALE_FACTOR, 
     FACE_DETECTION_MIN_NEIGHBORS, 
-    FACE_DETECTION_MIN_SIZE
+    FACE_DETECTION_MIN_SIZE,
+    FACE_DETECTION_MAX_WIDTH,
+    FACE_DETECTION_MODEL_PATH
 )
+from modules.iot_controller import get_local_camera
 from modules.speech_manager import get_voice_input
 
 
@@ -19,8 +25,95 @@ from modules.speech_manager import get_voice_input
 if not os.path.exists(FACE_OUTPUT_DIR):
     os.makedirs(FACE_OUTPUT_DIR)
 
-# Load Face Detector
-face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+# Pending (write_function, args) disk writes, drained by a single writer thread
+_WRITE_QUEUE = queue.Queue()
+
+# Line-buffered append handle for face_log.txt, opened lazily by the writer
+_LOG_FH = None
+
+
+def _write_bytes(path, data):
+    """
+    Writes an encoded registration image to disk.
+    """
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _log_line(line):
+    """
+    Appends a line to the face log through the persistent handle.
+    """
+    global _LOG_FH
+    if _LOG_FH is None:
+        _LOG_FH = open(os.path.join(FACE_OUTPUT_DIR, "face_log.txt"), "a", buffering=1)
+    _LOG_FH.write(line)
+
+
+def _close_log():
+    """
+    Closes the persistent face log handle so the file can be rewritten.
+    """
+    global _LOG_FH
+    if _LOG_FH is not None:
+        _LOG_FH.close()
+        _LOG_FH = None
+
+
+def _writer_loop():
+    """
+    Writes queued registration log lines to disk in order.
+    """
+    while True:
+        write, args = _WRITE_QUEUE.get()
+        try:
+            write(*args)
+        except Exception as e:
+            print(f"Error writing registration data: {e}")
+        finally:
+            _WRITE_QUEUE.task_done()
+
+
+def flush_pending_writes():
+    """
+    Blocks until every queued registration write has reached the disk.
+    """
+    _WRITE_QUEUE.join()
+
+
+def _shutdown_writer():
+    """
+    Flushes pending writes and closes the face log at interpreter exit.
+    """
+    flush_pending_writes()
+    _close_log()
+
+
+threading.Thread(target=_writer_loop, daemon=True).start()
+atexit.register(_shutdown_writer)
+
+
+def _create_dnn_detector():
+    """
+    Creates the YuNet DNN face detector if the model file is available.
+    
+    Returns:
+        cv2.FaceDetectorYN: Face detector or None if YuNet cannot be used
+    """
+    if not hasattr(cv2, "FaceDetectorYN") or not os.path.exists(FACE_DETECTION_MODEL_PATH):
+        return None
+    try:
+        return cv2.FaceDetectorYN.create(FACE_DETECTION_MODEL_PATH, "", (320, 240))
+    except cv2.error as e:
+        print(f"Could not load YuNet face detector, falling back to Haar cascade: {e}")
+        return None
+
+
+# Load Face Detector (YuNet when available, Haar cascade otherwise)
+face_detector = _create_dnn_detector()
+face_cascade = None
+if face_detector is None:
+    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
 
 
 def get_frame():
@@ -31,14 +124,14 @@ def get_frame():
         numpy.ndarray: Captured frame or None if failed
     """
     try:
-        cap = cv2.VideoCapture(0)  # Use default camera
+        # Shared with iot_controller, so servo flushes apply to this handle too
+        cap = get_local_camera()
 
         if not cap.isOpened():
             print("❌ Error: Could not open camera.")
             return None
         
         ret, frame = cap.read()
-        cap.release()  # Release the camera
 
         if not ret:
             print("❌ Error: Failed to capture frame.")
@@ -52,7 +145,7 @@ def get_frame():
 
 def detect_faces(frame):
     """
-    Detects faces in a given frame using OpenCV Haar Cascade.
+    Detects faces in a given frame using OpenCV's YuNet detector or Haar Cascade.
     
     Args:
         frame (numpy.ndarray): Input frame to detect faces in
@@ -61,14 +154,34 @@ def detect_faces(frame):
         list: List of face coordinates (x, y, w, h) or empty list if no faces
     """
     try:
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)  # Convert to grayscale
-        faces = face_cascade.detectMultiScale(
-            gray, 
-            scaleFactor=FACE_DETECTION_SCALE_FACTOR, 
-            minNeighbors=FACE_DETECTION_MIN_NEIGHBORS, 
-            minSize=(FACE_DETECTION_MIN_SIZE, FACE_DETECTION_MIN_SIZE)
-        )
-        return faces
+        # Downscale wide frames; detection cost grows with the pixel count
+        scale = min(1.0, FACE_DETECTION_MAX_WIDTH / frame.shape[1])
+        if scale < 1.0:
+            frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        
+        min_size = max(1, int(FACE_DETECTION_MIN_SIZE * scale))
+        if face_detector is not None:
+            # YuNet consumes BGR directly, no grayscale pass needed
+            height, width = frame.shape[:2]
+            face_detector.setInputSize((width, height))
+            _, detections = face_detector.detect(frame)
+            if detections is None:
+                return []
+            faces = [
+                detection[:4] for detection in detections
+                if detection[2] >= min_size and detection[3] >= min_size
+            ]
+        else:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)  # Convert to grayscale
+            faces = face_cascade.detectMultiScale(
+                gray, 
+                scaleFactor=FACE_DETECTION_SCALE_FACTOR, 
+                minNeighbors=FACE_DETECTION_MIN_NEIGHBORS, 
+                minSize=(min_size, min_size)
+            )
+        
+        # Map detections back to full-resolution coordinates
+        return [tuple(int(round(v / scale)) for v in face) for face in faces]
     except Exception as e:
         print(f"Error detecting faces: {e}")
         return []
@@ -115,14 +228,20 @@ def register_new_face():
         file_name = f"{person_name}_{timestamp}.jpg"
         output_path = os.path.join(FACE_OUTPUT_DIR, file_name)
 
-        # Save the image
-        cv2.imwrite(output_path, frame)
+        # The image is written before success is reported; only the log line is deferred
+        ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        if not ok:
+            print("❌ Failed to encode image.")
+            return None
+        try:
+            _write_bytes(output_path, buffer.tobytes())
+        except Exception as e:
+            print(f"❌ Failed to save image: {e}")
+            return None
         print(f"✅ Image saved as: {output_path}")
 
-        # Store name in a text file (for reference)
-        log_file_path = os.path.join(FACE_OUTPUT_DIR, "face_log.txt")
-        with open(log_file_path, "a") as f:
-            f.write(f"{person_name}, {output_path}\n")
+        # Store name in a text file (for reference), written by the writer thread
+        _WRITE_QUEUE.put((_log_line, (f"{person_name}, {output_path}\n",)))
 
         return person_name  # Return the detected name for further use
         
@@ -166,19 +285,20 @@ def get_registered_faces():
         list: List of registered person names
     """
     try:
+        flush_pending_writes()  # Include registrations still being written
         log_file_path = os.path.join(FACE_OUTPUT_DIR, "face_log.txt")
         if not os.path.exists(log_file_path):
             return []
         
-        registered_faces = []
+        # dict preserves registration order while deduplicating in O(1)
+        registered_faces = {}
         with open(log_file_path, "r") as f:
             for line in f:
                 if line.strip():
-                    name = line.split(",")[0].strip()
-                    if name not in registered_faces:
-                        registered_faces.append(name)
+                    name = line.split(",", 1)[0].strip()
+                    registered_faces.setdefault(name, None)
         
-        return registered_faces
+        return list(registered_faces)
         
     except Exception as e:
         print(f"Error reading registered faces: {e}")
@@ -196,34 +316,36 @@ def delete_face_registration(person_name):
         bool: True if deletion successful, False otherwise
     """
     try:
+        # Finish pending writes and release the append handle before rewriting
+        _WRITE_QUEUE.put((_close_log, ()))
+        flush_pending_writes()
         log_file_path = os.path.join(FACE_OUTPUT_DIR, "face_log.txt")
         if not os.path.exists(log_file_path):
             print(f"No registrations found for {person_name}")
             return False
         
-        # Read all registrations
-        registrations = []
+        # Stream surviving registrations into a temporary log in a single pass
         deleted_files = []
+        temp_log_path = log_file_path + ".tmp"
         
-        with open(log_file_path, "r") as f:
-            for line in f:
+        with open(log_file_path, "r") as src, open(temp_log_path, "w") as dst:
+            for line in src:
                 if line.strip():
-                    name, file_path = line.strip().split(",", 1)
+                    name, _, file_path = line.partition(",")
                     if name.strip() == person_name:
                         deleted_files.append(file_path.strip())
                     else:
-                        registrations.append(line)
+                        dst.write(line)
         
-        # Delete image files
+        # Atomically swap in the rewritten log
+        os.replace(temp_log_path, log_file_path)
+        
+        # Delete image files only once the log no longer references them
         for file_path in deleted_files:
             if os.path.exists(file_path):
                 os.unlink(file_path)
                 print(f"Deleted image: {file_path}")
         
-        # Rewrite log file without deleted registrations
-        with open(log_file_path, "w") as f:
-            f.writelines(registrations)
-        
         print(f"Deleted {len(deleted_files)} registration(s) for {person_name}")
         return True
         
@@ -244,14 +366,17 @@ def get_face_detection_stats():
             'total_registrations': 0,
             'registered_persons': [],
             'output_directory': FACE_OUTPUT_DIR,
+            'detector': 'yunet' if face_detector is not None else 'haar_cascade',
             'detection_parameters': {
                 'scale_factor': FACE_DETECTION_SCALE_FACTOR,
                 'min_neighbors': FACE_DETECTION_MIN_NEIGHBORS,
-                'min_size': FACE_DETECTION_MIN_SIZE
+                'min_size': FACE_DETECTION_MIN_SIZE,
+                'max_width': FACE_DETECTION_MAX_WIDTH
             }
         }
         
         # Count registrations
+        flush_pending_writes()
         log_file_path = os.path.join(FACE_OUTPUT_DIR, "face_log.txt")
         if os.path.exists(log_file_path):
             with open(log_file_path, "r") as f:
@@ -0,0 +1,16 @@
+"""
+Gemini Client Module
+Configures Google's Generative AI once and provides the shared model instances.
+"""
+
+import google.generativeai as genai
+from config import GEMINI_API_KEY
+
+# Configure the API key for Google Generative AI
+genai.configure(api_key=GEMINI_API_KEY)
+
+# Vision/text model shared by the vision helper and the object and video modules
+MODEL = genai.GenerativeModel("gemini-1.5-flash")
+
+# Text model used for document question answering
+RAG_MODEL = genai.GenerativeModel("gemini-pro")
@@ -3,40 +3,131 @@ IoT Controller Module
 Handles camera operations and servo motor control for the AEye system.
 """
 
+import atexit
 import cv2
-import urllib.request
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import requests
-from config import ESP32_CAM_URL, ESP32_SERVO_URL, CAMERA_INDEX
+from requests.adapters import HTTPAdapter
+from config import (
+    ESP32_CAM_URL,
+    ESP32_SERVO_URL,
+    CAMERA_INDEX,
+    CAMERA_FRAME_WIDTH,
+    CAMERA_FRAME_HEIGHT
+)
 
+# Keep-alive HTTP session shared by every ESP32 camera and servo request
+_SESSION = requests.Session()
+_SESSION.headers["Connection"] = "keep-alive"
+_SESSION.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
 
-def get_frame():
+# Time the servo needs to physically settle after a move, in seconds
+SERVO_SETTLE_TIME = 0.25
+
+# Workers for servo requests that overlap with other waits
+_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+# How long a camera status check stays valid, in seconds
+CAMERA_STATUS_CACHE_TTL = 2.0
+
+# Last camera status check, keyed on a monotonic timestamp
+_STATUS_CACHE = {"t": 0.0, "v": None}
+
+# Size frames are shrunk to before comparing scenes
+SCENE_COMPARE_SIZE = (160, 90)
+
+# Local webcam handle kept open for the process lifetime, shared by every module
+_LOCAL_CAP = None
+
+
+def get_local_camera():
     """
-    Fetches a single frame from the camera (ESP32-CAM or local webcam).
+    Returns the shared local webcam capture, opening it on first use.
+    Every module reads the webcam through this handle; callers must not release it.
     
     Returns:
-        numpy.ndarray: Captured frame as OpenCV image array or None if failed
+        cv2.VideoCapture: Opened (or failed-to-open) capture device
+    """
+    global _LOCAL_CAP
+    if _LOCAL_CAP is None or not _LOCAL_CAP.isOpened():
+        backend = cv2.CAP_V4L2 if sys.platform == "linux" else cv2.CAP_ANY
+        _LOCAL_CAP = cv2.VideoCapture(CAMERA_INDEX, backend)
+        # MJPG at a modest resolution is cheap to decode and plenty for the vision model
+        _LOCAL_CAP.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+        _LOCAL_CAP.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_FRAME_WIDTH)
+        _LOCAL_CAP.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_FRAME_HEIGHT)
+        # Keep a single buffered frame so reads are never stale
+        _LOCAL_CAP.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return _LOCAL_CAP
+
+
+def _release_local_cap():
+    """
+    Releases the shared local webcam capture at interpreter exit.
+    """
+    if _LOCAL_CAP is not None:
+        _LOCAL_CAP.release()
+
+
+atexit.register(_release_local_cap)
+
+
+def flush_camera(n=3):
+    """
+    Discards buffered local webcam frames without decoding them.
+    Useful after moving the servo, so frames captured mid-motion are dropped.
+    
+    Args:
+        n (int): Number of frames to discard (default: 3)
+    """
+    # Only the local webcam buffers frames; never open it just to flush
+    if _LOCAL_CAP is None or not _LOCAL_CAP.isOpened():
+        return
+    for _ in range(n):
+        _LOCAL_CAP.grab()
+
+
+def _fetch_esp32_jpeg():
+    """
+    Fetches the raw JPEG bytes of a single ESP32-CAM frame.
+    
+    Returns:
+        bytes: JPEG image data or None if the ESP32-CAM is unavailable
     """
     try:
-        # Try ESP32-CAM first
-        img_resp = urllib.request.urlopen(ESP32_CAM_URL, timeout=5)
-        imgnp = np.array(bytearray(img_resp.read()), dtype=np.uint8)
-        frame = cv2.imdecode(imgnp, -1)  # Decode image
+        img_resp = _SESSION.get(ESP32_CAM_URL, timeout=5)
+        img_resp.raise_for_status()
         
-        if frame is not None:
-            return frame
+        # Every JPEG starts with the SOI marker
+        if img_resp.content.startswith(b"\xff\xd8"):
+            return img_resp.content
+        print("ESP32-CAM returned invalid image data, using local camera.")
     except Exception as e:
         print(f"ESP32-CAM not available, using local camera: {e}")
+    return None
+
+
+def _read_local_frame():
+    """
+    Reads a single frame from the local webcam.
     
+    Returns:
+        numpy.ndarray: Captured frame or None if failed
+    """
     try:
-        # Fallback to local webcam
-        cap = cv2.VideoCapture(CAMERA_INDEX)
+        cap = get_local_camera()
         if not cap.isOpened():
             print("Error: Could not open local camera.")
             return None
         
-        ret, frame = cap.read()
-        cap.release()  # Release the capture device
+        # Grab first, decode only the frame actually returned
+        ret = cap.grab()
+        frame = None
+        if ret:
+            ret, frame = cap.retrieve()
         
         if not ret:
             print("Error: Failed to capture frame from local camera.")
@@ -48,6 +139,64 @@ def get_frame():
         return None
 
 
+def get_frame():
+    """
+    Fetches a single frame from the camera (ESP32-CAM or local webcam).
+    
+    Returns:
+        numpy.ndarray: Captured frame as OpenCV image array or None if failed
+    """
+    # Try ESP32-CAM first
+    jpeg_bytes = _fetch_esp32_jpeg()
+    if jpeg_bytes is not None:
+        imgnp = np.frombuffer(jpeg_bytes, dtype=np.uint8)  # Zero-copy view
+        frame = cv2.imdecode(imgnp, cv2.IMREAD_COLOR)  # Decode image
+        if frame is not None:
+            return frame
+    
+    # Fallback to local webcam
+    return _read_local_frame()
+
+
+def get_frame_jpeg():
+    """
+    Fetches a single frame as JPEG bytes, ready to send to a vision model.
+    ESP32-CAM frames are passed through as delivered, without decoding.
+    
+    Returns:
+        tuple: (jpeg_bytes, mime_type) or (None, None) if failed
+    """
+    # Try ESP32-CAM first
+    jpeg_bytes = _fetch_esp32_jpeg()
+    if jpeg_bytes is not None:
+        return jpeg_bytes, "image/jpeg"
+    
+    # Fallback to local webcam, encoding the frame once
+    frame = _read_local_frame()
+    if frame is None:
+        return None, None
+    ok, buffer = cv2.imencode(".jpg", frame)
+    if not ok:
+        print("Error: Failed to encode frame from local camera.")
+        return None, None
+    return buffer.tobytes(), "image/jpeg"
+
+
+def scene_signature(frame):
+    """
+    Shrinks a frame to a small grayscale image for cheap scene comparison.
+    Two signatures are compared by the mean of their cv2.absdiff.
+    
+    Args:
+        frame (numpy.ndarray): Frame in BGR order
+    
+    Returns:
+        numpy.ndarray: Downsampled grayscale frame
+    """
+    small = cv2.resize(frame, SCENE_COMPARE_SIZE, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+
 def set_servo_angle(angle):
     """
     Sends a request to the ESP32 to set the servo angle.
@@ -60,7 +209,7 @@ def set_servo_angle(angle):
     """
     try:
         url = f"{ESP32_SERVO_URL}/servo_angle?value={angle}"
-        response = requests.get(url, timeout=5)
+        response = _SESSION.get(url, timeout=5)
         
         if response.status_code == 200:
             print(f"Servo moved to angle {angle}°")
@@ -76,13 +225,51 @@ def set_servo_angle(angle):
         return False
 
 
+def set_servo_angle_async(angle):
+    """
+    Sends the servo request in the background without waiting for the ESP32 to reply.
+    
+    Args:
+        angle (int): Servo angle in degrees (0-180)
+    
+    Returns:
+        concurrent.futures.Future: Resolves to the result of set_servo_angle
+    """
+    return _EXECUTOR.submit(set_servo_angle, angle)
+
+
+def aim_camera(angle, settle_time=SERVO_SETTLE_TIME):
+    """
+    Moves the servo and waits until the camera is steady enough to capture.
+    Only the mechanical settle time is waited for; the servo's HTTP reply
+    arrives in the background and can be checked through the returned future.
+    
+    Args:
+        angle (int): Servo angle in degrees (0-180)
+        settle_time (float): Seconds the servo needs to settle after moving
+    
+    Returns:
+        concurrent.futures.Future: Resolves to True if servo control successful, False otherwise
+    """
+    servo_future = set_servo_angle_async(angle)
+    time.sleep(settle_time)
+    
+    # Drop frames captured while the servo was moving
+    flush_camera()
+    return servo_future
+
+
 def get_camera_status():
     """
     Checks the status of both ESP32-CAM and local camera.
+    Results are cached for CAMERA_STATUS_CACHE_TTL seconds so repeated checks stay cheap.
     
     Returns:
         dict: Status information for both cameras
     """
+    if _STATUS_CACHE["v"] and time.monotonic() - _STATUS_CACHE["t"] < CAMERA_STATUS_CACHE_TTL:
+        return dict(_STATUS_CACHE["v"])
+    
     status = {
         'esp32_cam': False,
         'local_camera': False,
@@ -90,19 +277,21 @@ def get_camera_status():
         'local_camera_index': CAMERA_INDEX
     }
     
-    # Check ESP32-CAM
+    # Check ESP32-CAM; the firmware captures a frame for any request method, so stream
+    # the GET and close it after the status line instead of reading the JPEG body
     try:
-        response = requests.get(ESP32_CAM_URL, timeout=3)
-        status['esp32_cam'] = response.status_code == 200
+        with _SESSION.get(ESP32_CAM_URL, timeout=3, stream=True) as response:
+            status['esp32_cam'] = response.status_code == 200
     except:
         status['esp32_cam'] = False
     
     # Check local camera
     try:
-        cap = cv2.VideoCapture(CAMERA_INDEX)
-        status['local_camera'] = cap.isOpened()
-        cap.release()
+        # Probe through the shared handle, which stays open for every other module to use
+        status['local_camera'] = get_local_camera().isOpened()
     except:
         status['local_camera'] = False
     
-    return status
+    _STATUS_CACHE["t"] = time.monotonic()
+    _STATUS_CACHE["v"] = status
+    return dict(status)
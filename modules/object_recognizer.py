@@ -3,17 +3,9 @@ Object Recognition Module
 Identifies objects in images and provides information about where to purchase them.
 """
 
-import google.generativeai as genai
-import cv2
-import tempfile
-import os
-from config import GEMINI_API_KEY
-from modules.iot_controller import get_frame
-from modules.speech_manager import speak_text
-from PIL import Image
-
-# Configure the API key for Google Generative AI
-genai.configure(api_key=GEMINI_API_KEY)
+from modules.gemini_client import MODEL
+from modules.speech_manager import speak_text, speak_stream
+from modules.vision import ask_gemini
 
 
 def recognize_object():
@@ -23,74 +15,50 @@ def recognize_object():
     Returns:
         str: Object description and purchase information or None if recognition failed
     """
-    try:
-        # Fetch a frame from the camera
-        frame = get_frame()
-        
-        if frame is None:
-            print("Error: Could not fetch frame from camera.")
-            return None
-        
-        # Convert BGR to RGB for PIL
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Save the captured frame temporarily as an image
-        temp_image_path = tempfile.mktemp(suffix=".jpg")
-        cv2.imwrite(temp_image_path, frame_rgb)
-        
-        try:
-            # Load the captured image into PIL
-            image = Image.open(temp_image_path)
-            
-            # Prompt for object recognition and purchase information
-            prompt = """Tell me about the object I am holding. What is this? 
-            Provide both online and offline purchase suggestions. 
-            Describe as much as possible within 3 lines. 
-            Do not use special symbols like (#, *, etc)."""
-            
-            # Use the generative model to generate the response
-            model = genai.GenerativeModel("gemini-1.5-flash")
-            response = model.generate_content([image, prompt])
-            
-            # Output and return the response
-            context = response.text
-            print("Object Recognition:", context)
-            speak_text(context)
-            return context
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_image_path):
-                os.unlink(temp_image_path)
-                
-    except Exception as e:
-        print(f"An error occurred while recognizing object: {e}")
-        return None
+    # Prompt for object recognition and purchase information
+    prompt = """Tell me about the object I am holding. What is this? 
+    Provide both online and offline purchase suggestions. 
+    Describe as much as possible within 3 lines. 
+    Do not use special symbols like (#, *, etc)."""
+    
+    context = ask_gemini(prompt)
+    if context:
+        print("Object Recognition:", context)
+        speak_text(context)
+    return context
 
 
-def generate_contextual_response(user_input, context):
+def generate_contextual_response(user_input, context, speak=False):
     """
     Generates a response based on the previous object recognition context.
     
     Args:
         user_input (str): User's follow-up question
         context (str): Previous object recognition context
+        speak (bool): Stream the response to text-to-speech sentence by sentence as it is generated
     
     Returns:
         str: Generated response or error message
     """
     if context:
         try:
-            model = genai.GenerativeModel("gemini-1.5-flash")
             combined_input = context + "\n" + "User: " + user_input
-            response = model.generate_content([combined_input])
-            print("Contextual Response:", response.text)
-            return response.text
+            if speak:
+                response = MODEL.generate_content([combined_input], stream=True)
+                text = speak_stream(chunk.text for chunk in response)
+            else:
+                text = MODEL.generate_content([combined_input]).text
+            print("Contextual Response:", text)
+            return text
         except Exception as e:
             print(f"Error generating contextual response: {e}")
-            return "Sorry, I couldn't process your request."
+            message = "Sorry, I couldn't process your request."
     else:
-        return "There is no context available to respond to your question."
+        message = "There is no context available to respond to your question."
+    
+    if speak:
+        speak_text(message)
+    return message
 
 
 def handle_follow_up_queries(context):
@@ -114,8 +82,8 @@ def handle_follow_up_queries(context):
                 break
             else:
                 print("Answering based on previous context...")
-                response = generate_contextual_response(user_query, context)
-                speak_text(response)
+                # Spoken while it streams in
+                generate_contextual_response(user_query, context, speak=True)
         else:
             speak_text("No valid input detected. Please try again or say 'exit' to end.")
             print("Invalid input for follow-up. Waiting for valid input...")
@@ -128,45 +96,13 @@ def analyze_multiple_objects():
     Returns:
         str: Analysis of multiple objects or None if failed
     """
-    try:
-        # Fetch a frame from the camera
-        frame = get_frame()
-        
-        if frame is None:
-            print("Error: Could not fetch frame from camera.")
-            return None
-        
-        # Convert BGR to RGB for PIL
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Save the captured frame temporarily as an image
-        temp_image_path = tempfile.mktemp(suffix=".jpg")
-        cv2.imwrite(temp_image_path, frame_rgb)
-        
-        try:
-            # Load the captured image into PIL
-            image = Image.open(temp_image_path)
-            
-            # Prompt for multiple object analysis
-            prompt = """Identify and describe all visible objects in this scene. 
-            For each object, provide a brief description and where it might be available for purchase. 
-            Keep the total response within 5 lines."""
-            
-            # Use the generative model to generate the response
-            model = genai.GenerativeModel("gemini-1.5-flash")
-            response = model.generate_content([image, prompt])
-            
-            # Output and return the response
-            result = response.text
-            print("Multiple Objects Analysis:", result)
-            speak_text(result)
-            return result
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_image_path):
-                os.unlink(temp_image_path)
-                
-    except Exception as e:
-        print(f"An error occurred while analyzing multiple objects: {e}")
-        return None
+    # Prompt for multiple object analysis
+    prompt = """Identify and describe all visible objects in this scene. 
+    For each object, provide a brief description and where it might be available for purchase. 
+    Keep the total response within 5 lines."""
+    
+    result = ask_gemini(prompt)
+    if result:
+        print("Multiple Objects Analysis:", result)
+        speak_text(result)
+    return result
@@ -3,13 +3,14 @@ Speech Manager Module
 Handles voice input (speech-to-text) and output (text-to-speech) functionality.
 """
 
+import atexit
+import queue
+import re
+import threading
 import pyaudio
-import wave
 import pyttsx3
 import warnings
 from google.cloud import speech_v1 as speech
-import os
-import tempfile
 from config import GOOGLE_CLOUD_CREDENTIALS_PATH, RECORDING_DURATION, SAMPLE_RATE
 
 # Suppress warnings
@@ -18,107 +19,240 @@ warnings.simplefilter("ignore", category=FutureWarning)
 # Initialize Google Speech-to-Text client
 client = speech.SpeechClient.from_service_account_file(GOOGLE_CLOUD_CREDENTIALS_PATH)
 
+# Recording parameters
+CHUNK_SIZE = 1024  # Buffer size
+AUDIO_FORMAT = pyaudio.paInt16  # 16-bit format
+CHANNELS = 1  # Mono
 
-def record_audio(output_file, duration=RECORDING_DURATION, sample_rate=SAMPLE_RATE):
+# Upper bound in seconds for a streamed utterance when no end of speech is detected
+MAX_UTTERANCE_DURATION = 15
+END_OF_UTTERANCE = speech.StreamingRecognizeResponse.SpeechEventType.END_OF_SINGLE_UTTERANCE
+
+# Whitespace after sentence-ending punctuation, or a line break, where streamed text is cut for speech
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+
+# PortAudio instance and microphone stream kept open between recordings
+_PA = None
+_STREAM = None
+_STREAM_RATE = None
+_STREAM_LOCK = threading.Lock()
+
+
+def _get_input_stream(sample_rate):
+    """
+    Returns the shared (stopped) microphone stream, opening it on first use.
+    Must be called with _STREAM_LOCK held.
+    
+    Args:
+        sample_rate (int): Audio sample rate in Hz
+    
+    Returns:
+        pyaudio.Stream: Microphone input stream
+    """
+    global _PA, _STREAM, _STREAM_RATE
+    if _PA is None:
+        _PA = pyaudio.PyAudio()
+    if _STREAM is None or _STREAM_RATE != sample_rate:
+        if _STREAM is not None:
+            _STREAM.close()
+        _STREAM = _PA.open(format=AUDIO_FORMAT, channels=CHANNELS, rate=sample_rate,
+                           input=True, frames_per_buffer=CHUNK_SIZE, start=False)
+        _STREAM_RATE = sample_rate
+    return _STREAM
+
+
+def _close_audio():
+    """
+    Closes the shared microphone stream and PortAudio at interpreter exit.
+    """
+    with _STREAM_LOCK:
+        if _STREAM is not None:
+            _STREAM.close()
+        if _PA is not None:
+            _PA.terminate()
+
+
+atexit.register(_close_audio)
+
+# Text waiting to be spoken, drained by a single text-to-speech worker
+_TTS_QUEUE = queue.Queue()
+
+
+def _tts_worker():
+    """
+    Speaks queued text in order using one pyttsx3 engine owned by this thread.
     """
-    Records audio from the microphone and saves it as a WAV file.
+    engine = None
+    while True:
+        text = _TTS_QUEUE.get()
+        try:
+            if engine is None:
+                engine = pyttsx3.init()
+            engine.say(text)
+            engine.runAndWait()
+        except Exception as e:
+            print(f"Error in text-to-speech: {e}")
+        finally:
+            _TTS_QUEUE.task_done()
+
+
+def wait_for_speech():
+    """
+    Blocks until all queued text has been spoken.
+    """
+    _TTS_QUEUE.join()
+
+
+threading.Thread(target=_tts_worker, daemon=True).start()
+# Let pending speech finish before the interpreter exits
+atexit.register(wait_for_speech)
+
+
+def record_audio(duration=RECORDING_DURATION, sample_rate=SAMPLE_RATE):
+    """
+    Records audio from the microphone as raw PCM.
     
     Args:
-        output_file (str): Path to save the recorded audio file
         duration (int): Recording duration in seconds (default: 5)
         sample_rate (int): Audio sample rate in Hz (default: 16000)
     
     Returns:
-        bool: True if recording successful, False otherwise
+        bytes: Recorded 16-bit mono PCM audio or None if recording failed
     """
-    chunk = 1024  # Buffer size
-    format = pyaudio.paInt16  # 16-bit format
-    channels = 1  # Mono
     rate = sample_rate  # Sample rate
-
+    
     try:
-        p = pyaudio.PyAudio()
-        stream = p.open(format=format, channels=channels, rate=rate, input=True, frames_per_buffer=chunk)
-        
-        print("Recording speech... Speak now!")
-        frames = []
-        for _ in range(0, int(rate / chunk * duration)):
-            data = stream.read(chunk)
-            frames.append(data)
+        # Don't record our own voice
+        wait_for_speech()
+        with _STREAM_LOCK:
+            stream = _get_input_stream(rate)
+            stream.start_stream()
+            try:
+                print("Recording speech... Speak now!")
+                frames = []
+                for _ in range(0, int(rate / CHUNK_SIZE * duration)):
+                    data = stream.read(CHUNK_SIZE)
+                    frames.append(data)
+                
+                print("Recording finished.")
+            finally:
+                stream.stop_stream()
         
-        print("Recording finished.")
+        return b''.join(frames)
+    except Exception as e:
+        print(f"Error recording audio: {e}")
+        return None
 
-        stream.stop_stream()
-        stream.close()
-        p.terminate()
 
-        with wave.open(output_file, "wb") as wf:
-            wf.setnchannels(channels)
-            wf.setsampwidth(p.get_sample_size(format))
-            wf.setframerate(rate)
-            wf.writeframes(b''.join(frames))
+def transcribe_audio(pcm_bytes, sample_rate=SAMPLE_RATE):
+    """
+    Transcribe speech from recorded PCM audio using Google Cloud Speech-to-Text.
+    
+    Args:
+        pcm_bytes (bytes): 16-bit mono PCM audio, as returned by record_audio
+        sample_rate (int): Sample rate the audio was recorded at (default: 16000)
+    
+    Returns:
+        str: Transcribed text or None if transcription failed
+    """
+    try:
+        # LINEAR16 takes the raw samples directly, no WAV container needed
+        audio = speech.RecognitionAudio(content=pcm_bytes)
+        config = speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=sample_rate,
+            language_code='en-US'  # English language code
+        )
         
-        return True
+        response = client.recognize(config=config, audio=audio)
+        
+        for result in response.results:
+            transcript = result.alternatives[0].transcript
+            return transcript
+        
+        return None
     except Exception as e:
-        print(f"Error recording audio: {e}")
-        return False
+        print(f"Error transcribing audio: {e}")
+        return None
 
 
-def transcribe_audio(input_file):
+def transcribe_stream(max_duration=MAX_UTTERANCE_DURATION, sample_rate=SAMPLE_RATE):
     """
-    Transcribe speech from the recorded audio file using Google Cloud Speech-to-Text.
+    Streams microphone audio to Google Cloud Speech-to-Text while recording.
+    Transcription overlaps recording, and Google ends the utterance on silence.
     
     Args:
-        input_file (str): Path to the audio file to transcribe
+        max_duration (int): Maximum recording duration in seconds (default: 15)
+        sample_rate (int): Audio sample rate in Hz (default: 16000)
     
     Returns:
         str: Transcribed text or None if transcription failed
     """
+    streaming_config = speech.StreamingRecognitionConfig(
+        config=speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=sample_rate,
+            language_code='en-US'  # English language code
+        ),
+        interim_results=False,
+        single_utterance=True
+    )
+    utterance_ended = threading.Event()
+    # Held by gRPC's request thread for the duration of each microphone read
+    read_lock = threading.Lock()
+    
+    def audio_requests(stream):
+        # Feed microphone chunks until Google detects the end of the utterance
+        for _ in range(0, int(sample_rate / CHUNK_SIZE * max_duration)):
+            with read_lock:
+                # Checked under the lock so no read starts once listening has finished
+                if utterance_ended.is_set():
+                    break
+                data = stream.read(CHUNK_SIZE, exception_on_overflow=False)
+            yield speech.StreamingRecognizeRequest(audio_content=data)
+    
     try:
-        with open(input_file, 'rb') as audio_file:
-            content = audio_file.read()
-            audio = speech.RecognitionAudio(content=content)
-            config = speech.RecognitionConfig(
-                encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
-                sample_rate_hertz=SAMPLE_RATE,
-                language_code='en-US'  # English language code
-            )
-            
-            response = client.recognize(config=config, audio=audio)
-            
-            for result in response.results:
-                transcript = result.alternatives[0].transcript
-                return transcript
-            
-            return None
+        # Don't record our own voice
+        wait_for_speech()
+        with _STREAM_LOCK:
+            stream = _get_input_stream(sample_rate)
+            stream.start_stream()
+            responses = None
+            try:
+                print("Listening... Speak now!")
+                responses = client.streaming_recognize(streaming_config, audio_requests(stream))
+                
+                for response in responses:
+                    if response.speech_event_type == END_OF_UTTERANCE:
+                        utterance_ended.set()
+                    for result in response.results:
+                        if result.is_final and result.alternatives:
+                            return result.alternatives[0].transcript
+                
+                return None
+            finally:
+                utterance_ended.set()
+                # Stop the call so gRPC stops pulling audio, then wait out a read in progress
+                # before stopping the shared stream and releasing _STREAM_LOCK
+                if responses is not None:
+                    responses.cancel()
+                with read_lock:
+                    stream.stop_stream()
+                print("Listening finished.")
     except Exception as e:
-        print(f"Error transcribing audio: {e}")
+        print(f"Error in streaming transcription: {e}")
         return None
 
 
 def get_voice_input():
     """
-    Records audio from microphone and converts it to text.
+    Captures voice input from the microphone and converts it to text.
     
     Returns:
         str: Transcribed text from voice input or None if failed
     """
     try:
-        # Create temporary file for recording
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            temp_audio_path = temp_file.name
-        
-        # Record audio
-        if record_audio(temp_audio_path, duration=RECORDING_DURATION):
-            # Transcribe audio
-            transcript = transcribe_audio(temp_audio_path)
-            
-            # Clean up temporary file
-            os.unlink(temp_audio_path)
-            
-            return transcript
-        else:
-            return None
+        return transcribe_stream()
     except Exception as e:
         print(f"Error in voice input: {e}")
         return None
@@ -126,14 +260,41 @@ def get_voice_input():
 
 def speak_text(text):
     """
-    Convert text to speech using pyttsx3.
+    Queue text to be converted to speech using pyttsx3.
+    Returns immediately; playback runs on a background worker.
+    Use wait_for_speech() to block until it has been spoken.
     
     Args:
         text (str): Text to convert to speech
     """
-    try:
-        engine = pyttsx3.init()
-        engine.say(text)
-        engine.runAndWait()
-    except Exception as e:
-        print(f"Error in text-to-speech: {e}")
+    _TTS_QUEUE.put(text)
+
+
+def speak_stream(chunks):
+    """
+    Speaks streamed text as it arrives, one complete sentence at a time,
+    so playback of early sentences overlaps generation of later ones.
+    
+    Args:
+        chunks (Iterable[str]): Text fragments in arrival order
+    
+    Returns:
+        str: The full text that was streamed
+    """
+    parts = []
+    pending = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        parts.append(chunk)
+        pending += chunk
+        
+        # Queue every finished sentence; keep the unfinished tail for the next chunk
+        *sentences, pending = SENTENCE_BOUNDARY.split(pending)
+        for sentence in sentences:
+            if sentence.strip():
+                speak_text(sentence)
+    
+    if pending.strip():
+        speak_text(pending)
+    return "".join(parts)
@@ -3,36 +3,117 @@ Text Extraction Module
 Extracts text from images using OCR (Optical Character Recognition) technology.
 """
 
+import time
+from collections import OrderedDict
 from groq import Groq
 import cv2
-import base64
-import os
 from config import GROQ_API_KEY
-from modules.iot_controller import get_frame
-from modules.speech_manager import speak_text
+from modules.iot_controller import get_frame, scene_signature
+from modules.speech_manager import speak_text, speak_stream
 
+# pybase64 encodes with SIMD; the standard library is the fallback
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 
-def encode_image_from_frame(frame, output_path="captured_frame.jpg"):
+# Longest image side and JPEG quality sent to the vision model; text stays legible at both
+OCR_MAX_SIDE = 1024
+OCR_JPEG_QUALITY = 75
+
+# Largest mean absolute grayscale difference (0-255) between scene signatures still counted
+# as the same frame; far tighter than a scene change, so a turned page never matches
+FRAME_MATCH_MAX_DIFFERENCE = 1.5
+
+# How many recent results are remembered, and for how long in seconds
+FRAME_CACHE_SIZE = 32
+FRAME_CACHE_TTL = 30
+
+# Recent results keyed on (prompt key, signature bytes), most recent last;
+# values are (timestamp, signature, text)
+_FRAME_CACHE = OrderedDict()
+
+# Groq client shared by every extraction call
+_CLIENT = None
+
+
+def get_client():
     """
-    Saves the frame and encodes it to base64 for API transmission.
+    Returns the shared Groq client, creating it on first use.
+    
+    Returns:
+        Groq: Groq API client
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = Groq(api_key=GROQ_API_KEY)
+    return _CLIENT
+
+
+def _lookup_cached_text(prompt_key, signature):
+    """
+    Returns a recent result for a near-identical frame and the same prompt.
+    
+    Args:
+        prompt_key (str): Identifies the prompt the result was produced with
+        signature (numpy.ndarray): Scene signature of the current frame
+    
+    Returns:
+        str: Cached text or None on a miss
+    """
+    now = time.monotonic()
+    for key, (timestamp, cached_signature, text) in list(_FRAME_CACHE.items()):
+        if now - timestamp >= FRAME_CACHE_TTL:
+            del _FRAME_CACHE[key]
+            continue
+        if (key[0] == prompt_key
+                and cv2.absdiff(cached_signature, signature).mean() <= FRAME_MATCH_MAX_DIFFERENCE):
+            _FRAME_CACHE.move_to_end(key)
+            return text
+    return None
+
+
+def _cache_text(prompt_key, signature, text):
+    """
+    Remembers a result for the frame, dropping the least recently used entry when full.
+    
+    Args:
+        prompt_key (str): Identifies the prompt the result was produced with
+        signature (numpy.ndarray): Scene signature of the frame the result describes
+        text (str): Model response
+    """
+    key = (prompt_key, signature.tobytes())
+    _FRAME_CACHE[key] = (time.monotonic(), signature, text)
+    _FRAME_CACHE.move_to_end(key)
+    while len(_FRAME_CACHE) > FRAME_CACHE_SIZE:
+        _FRAME_CACHE.popitem(last=False)
+
+
+def encode_image_from_frame(frame, max_side=OCR_MAX_SIDE, quality=OCR_JPEG_QUALITY):
+    """
+    Downscales the frame, encodes it as JPEG in memory and base64-encodes it for API transmission.
     
     Args:
         frame (numpy.ndarray): Captured frame from camera
-        output_path (str): Path to save the captured frame
+        max_side (int): Longest side in pixels after downscaling (default: 1024)
+        quality (int): JPEG quality from 0 to 100 (default: 75)
     
     Returns:
         str: Base64 encoded image string
     """
     try:
-        cv2.imwrite(output_path, frame)  # Save the frame
-        with open(output_path, "rb") as image_file:
-            encoded_image = base64.b64encode(image_file.read()).decode("utf-8")
+        # Only ever shrink; INTER_AREA keeps small print readable
+        height, width = frame.shape[:2]
+        scale = min(1.0, max_side / max(height, width))
+        if scale < 1.0:
+            frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
         
-        # Clean up saved file
-        if os.path.exists(output_path):
-            os.unlink(output_path)
+        ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            print("Error encoding image: JPEG encoding failed")
+            return None
         
-        return encoded_image
+        return base64.b64encode(buffer).decode("ascii")
     except Exception as e:
         print(f"Error encoding image: {e}")
         return None
@@ -52,14 +133,23 @@ def extract_text_from_image():
             print("Failed to capture image.")
             return None
         
+        # A near-identical frame was just read with the same prompt; skip the API call
+        prompt_key = "text"
+        signature = scene_signature(frame)
+        cached = _lookup_cached_text(prompt_key, signature)
+        if cached is not None:
+            print("Extracted Text (cached):", cached)
+            speak_text(cached)
+            return cached
+        
         # Encode image to base64
         base64_image = encode_image_from_frame(frame)
         if not base64_image:
             print("Failed to encode image.")
             return None
 
-        # Initialize Groq client
-        client = Groq(api_key=GROQ_API_KEY)
+        # Reuse the shared Groq client and its open connections
+        client = get_client()
 
         # Send the image to Groq's Vision Model
         chat_completion = client.chat.completions.create(
@@ -86,12 +176,16 @@ def extract_text_from_image():
                 }
             ],
             model="llama-3.2-11b-vision-preview",
+            stream=True,
         )
 
-        # Extract and return the response
-        extracted_text = chat_completion.choices[0].message.content
+        # Speak each sentence as it streams in, then return the full response
+        extracted_text = speak_stream(
+            chunk.choices[0].delta.content for chunk in chat_completion if chunk.choices
+        )
         print("Extracted Text:", extracted_text)
-        speak_text(extracted_text)
+        if extracted_text:
+            _cache_text(prompt_key, signature, extracted_text)
         return extracted_text
         
     except Exception as e:
@@ -116,14 +210,23 @@ def extract_text_with_context(context_description):
             print("Failed to capture image.")
             return None
         
+        # A near-identical frame was just read with the same prompt; skip the API call
+        prompt_key = f"context:{context_description}"
+        signature = scene_signature(frame)
+        cached = _lookup_cached_text(prompt_key, signature)
+        if cached is not None:
+            print("Contextual Text Extraction (cached):", cached)
+            speak_text(cached)
+            return cached
+        
         # Encode image to base64
         base64_image = encode_image_from_frame(frame)
         if not base64_image:
             print("Failed to encode image.")
             return None
 
-        # Initialize Groq client
-        client = Groq(api_key=GROQ_API_KEY)
+        # Reuse the shared Groq client and its open connections
+        client = get_client()
 
         # Send the image to Groq's Vision Model with context
         chat_completion = client.chat.completions.create(
@@ -146,12 +249,16 @@ def extract_text_with_context(context_description):
                 }
             ],
             model="llama-3.2-11b-vision-preview",
+            stream=True,
         )
 
-        # Extract and return the response
-        extracted_text = chat_completion.choices[0].message.content
+        # Speak each sentence as it streams in, then return the full response
+        extracted_text = speak_stream(
+            chunk.choices[0].delta.content for chunk in chat_completion if chunk.choices
+        )
         print("Contextual Text Extraction:", extracted_text)
-        speak_text(extracted_text)
+        if extracted_text:
+            _cache_text(prompt_key, signature, extracted_text)
         return extracted_text
         
     except Exception as e:
@@ -173,14 +280,23 @@ def extract_structured_data():
             print("Failed to capture image.")
             return None
         
+        # A near-identical frame was just read with the same prompt; skip the API call
+        prompt_key = "structured"
+        signature = scene_signature(frame)
+        cached = _lookup_cached_text(prompt_key, signature)
+        if cached is not None:
+            print("Structured Data (cached):", cached)
+            speak_text(cached)
+            return cached
+        
         # Encode image to base64
         base64_image = encode_image_from_frame(frame)
         if not base64_image:
             print("Failed to encode image.")
             return None
 
-        # Initialize Groq client
-        client = Groq(api_key=GROQ_API_KEY)
+        # Reuse the shared Groq client and its open connections
+        client = get_client()
 
         # Send the image to Groq's Vision Model for structured data extraction
         chat_completion = client.chat.completions.create(
@@ -207,12 +323,16 @@ def extract_structured_data():
                 }
             ],
             model="llama-3.2-11b-vision-preview",
+            stream=True,
         )
 
-        # Extract and return the response
-        structured_data = chat_completion.choices[0].message.content
+        # Speak each sentence as it streams in, then return the full response
+        structured_data = speak_stream(
+            chunk.choices[0].delta.content for chunk in chat_completion if chunk.choices
+        )
         print("Structured Data:", structured_data)
-        speak_text(structured_data)
+        if structured_data:
+            _cache_text(prompt_key, signature, structured_data)
         return structured_data
         
     except Exception as e:
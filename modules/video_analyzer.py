@@ -5,10 +5,10 @@ Handles video frame capture, face recognition, and scene description generation.
 
 import os
 import time
-from threading import Thread
-from queue import Queue
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Semaphore, Thread
+from queue import Empty, SimpleQueue
 from moviepy.video.io.VideoFileClip import VideoFileClip
-import google.generativeai as genai
 from fpdf import FPDF
 import re
 from PIL import Image
@@ -16,11 +16,54 @@ import cv2
 import json
 from datetime import datetime
 import face_recognition
+import numpy as np
+
+# The CNN face detector can run a whole batch of frames at once on a CUDA build of dlib
+try:
+    import dlib
+    USE_CUDA = bool(dlib.DLIB_USE_CUDA) and dlib.cuda.get_num_devices() > 0
+except Exception:
+    USE_CUDA = False
 from config import GEMINI_API_KEY
+from modules.gemini_client import MODEL
+from modules.iot_controller import get_local_camera, scene_signature
 
-# Configure Google Generative AI
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel("gemini-1.5-flash")
+# Typographic punctuation mapped to ASCII in a single pass over each description
+SPECIAL_CHARACTER_TABLE = str.maketrans({
+    "\u2018": "'", "\u2019": "'",  # Curly single quotes
+    "\u201c": '"', "\u201d": '"',  # Curly double quotes
+    "\u2013": "-", "\u2014": "-",  # En and em dashes
+    "\u2022": "*",  # Bullet
+})
+
+# Largest face encoding distance still counted as a match (face_recognition's default)
+FACE_MATCH_TOLERANCE = 0.6
+
+# Frames are searched for faces at this scale first, then at full size if none are found
+FACE_DETECTION_DOWNSCALE = 0.5
+
+# Length of a face_recognition encoding
+FACE_ENCODING_SIZE = 128
+
+# Mean absolute grayscale difference (0-255) above which a sampled frame counts as a new scene
+SCENE_CHANGE_THRESHOLD = 8.0
+
+# Longest gap in seconds between queued frames, even when the scene has not changed
+STATIC_SCENE_INTERVAL = 30
+
+# Most frames described together in one Gemini call
+DESCRIBE_BATCH_SIZE = 4
+
+# Longest wait in seconds for more buffered frames before sending a partial batch
+DESCRIBE_BATCH_WAIT = 0.5
+
+# Batches described concurrently; kept low to respect Gemini rate limits
+DESCRIBE_WORKERS = 4
+
+# Heading the model puts before each frame's description in a batched response. Accepts
+# markdown headings and emphasis ("## FRAME 1", "**FRAME 1:**") and text on the same line
+FRAME_HEADING = re.compile(r"^[ \t]*[#*_]*[ \t]*FRAME[ \t]+(\d+)[ \t]*[*_]*[ \t]*[:.-]?[ \t]*[*_]*\s*",
+                           re.MULTILINE | re.IGNORECASE)
 
 
 def replace_special_characters(text):
@@ -33,22 +76,74 @@ def replace_special_characters(text):
     Returns:
         str: Text with replaced special characters
     """
-    text = text.replace("'", "'").replace("'", "'")
-    text = text.replace(""", '"').replace(""", '"')
-    text = text.replace("–", "-").replace("—", "-")
-    text = text.replace("•", "*")
-    return text
+    return text.translate(SPECIAL_CHARACTER_TABLE)
+
+
+def known_faces_cache_path(known_faces_dir):
+    """
+    Returns the path of the encoding cache kept next to a known faces directory.
+
+    Args:
+        known_faces_dir (str): Directory containing known face images
+
+    Returns:
+        str: Path of the .npz cache file
+    """
+    # Outside the directory, so writing it does not change the directory's mtime
+    return os.path.normpath(os.path.abspath(known_faces_dir)) + "_encodings.npz"
+
+
+def _load_encoding_cache(cache_path, mtime):
+    """
+    Loads cached known face encodings if they were built from the current images.
+
+    Args:
+        cache_path (str): Path of the .npz cache file
+        mtime (float): Latest modification time of the known faces directory and images
+
+    Returns:
+        tuple: (known_encodings, known_names) or None if the cache is missing or stale
+    """
+    try:
+        with np.load(cache_path, allow_pickle=False) as data:
+            if float(data["mtime"]) != mtime:
+                return None
+            return data["encodings"].astype(np.float32, copy=False), [str(name) for name in data["names"]]
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Ignoring unreadable known faces cache: {e}")
+        return None
+
+
+def _save_encoding_cache(cache_path, known_encodings, known_names, mtime):
+    """
+    Saves known face encodings so the next start can skip encoding the images.
+
+    Args:
+        cache_path (str): Path of the .npz cache file
+        known_encodings (numpy.ndarray): Known face encodings, one per row
+        known_names (list): List of known face names
+        mtime (float): Latest modification time of the known faces directory and images
+    """
+    try:
+        np.savez(cache_path, names=np.array(known_names, dtype=str), encodings=known_encodings,
+                 mtime=np.float64(mtime))
+    except Exception as e:
+        print(f"Error saving known faces cache: {e}")
 
 
 def load_known_faces(known_faces_dir):
     """
     Load known face encodings and names from a directory.
+    Encodings are cached in an .npz file next to the directory and reused
+    until an image is added, removed or modified.
 
     Args:
         known_faces_dir (str): Directory containing known face images
 
     Returns:
-        tuple: (known_encodings, known_names)
+        tuple: (known_encodings, known_names) with the encodings stacked as a (K, 128) array
     """
     try:
         known_encodings = []
@@ -56,72 +151,148 @@ def load_known_faces(known_faces_dir):
         
         if not os.path.exists(known_faces_dir):
             print(f"Warning: Known faces directory {known_faces_dir} does not exist")
-            return known_encodings, known_names
+            return np.empty((0, FACE_ENCODING_SIZE), dtype=np.float32), known_names
+        
+        # DirEntry caches its type and stat results, saving a syscall per file
+        with os.scandir(known_faces_dir) as entries:
+            image_files = [
+                entry for entry in entries
+                if entry.is_file() and entry.name.lower().endswith((".png", ".jpg", ".jpeg"))
+            ]
+        
+        # Adding or removing an image changes the directory's mtime; editing one changes its own
+        mtime = max([os.path.getmtime(known_faces_dir)] + [entry.stat().st_mtime for entry in image_files])
+        cache_path = known_faces_cache_path(known_faces_dir)
+        cached = _load_encoding_cache(cache_path, mtime)
+        if cached is not None:
+            return cached
             
-        for filename in os.listdir(known_faces_dir):
-            if filename.lower().endswith((".png", ".jpg", ".jpeg")):
-                image_path = os.path.join(known_faces_dir, filename)
-                image = face_recognition.load_image_file(image_path)
-                encodings = face_recognition.face_encodings(image)
-                if encodings:
-                    known_encodings.append(encodings[0])
-                    known_names.append(os.path.splitext(filename)[0])
+        for entry in image_files:
+            # OpenCV decodes with libjpeg-turbo straight into an array; face_recognition wants RGB
+            image = cv2.imread(entry.path)
+            if image is None:
+                print(f"Warning: Could not read known face image {entry.path}")
+                continue
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            encodings = face_recognition.face_encodings(image)
+            if encodings:
+                known_encodings.append(encodings[0])
+                known_names.append(os.path.splitext(entry.name)[0])
         
+        # One contiguous matrix lets every comparison be a single vectorized norm
+        known_encodings = np.asarray(known_encodings, dtype=np.float32).reshape(-1, FACE_ENCODING_SIZE)
+        _save_encoding_cache(cache_path, known_encodings, known_names, mtime)
         return known_encodings, known_names
     except Exception as e:
         print(f"Error loading known faces: {e}")
-        return [], []
+        return np.empty((0, FACE_ENCODING_SIZE), dtype=np.float32), []
 
 
-def recognize_faces(image_path, known_encodings, known_names):
+def recognize_faces(image, known_encodings, known_names):
     """
     Recognize faces in an image using known face encodings.
 
     Args:
-        image_path (str): Path to the image to analyze
-        known_encodings (list): List of known face encodings
+        image (numpy.ndarray): RGB image to analyze
+        known_encodings (numpy.ndarray): Known face encodings, one per row
         known_names (list): List of known face names
 
     Returns:
         list: List of recognized face names
     """
     try:
-        image = face_recognition.load_image_file(image_path)
-        encodings = face_recognition.face_encodings(image)
-        recognized_faces = []
-        
-        for encoding in encodings:
-            if known_encodings:
-                results = face_recognition.compare_faces(known_encodings, encoding)
-                distances = face_recognition.face_distance(known_encodings, encoding)
-                if any(results):
-                    best_match_index = distances.argmin()
-                    recognized_faces.append(known_names[best_match_index])
-                else:
-                    recognized_faces.append("Unknown")
-            else:
-                recognized_faces.append("Unknown")
+        # The HOG detector costs roughly one pass per pixel, so try a smaller frame first
+        small = cv2.resize(image, (0, 0), fx=FACE_DETECTION_DOWNSCALE, fy=FACE_DETECTION_DOWNSCALE,
+                           interpolation=cv2.INTER_AREA)
+        locations = face_recognition.face_locations(small, model="hog")
+        if locations:
+            encodings = face_recognition.face_encodings(small, locations)
+        else:
+            # Small or distant faces may only be found at full resolution
+            encodings = face_recognition.face_encodings(image)
         
-        return recognized_faces
+        return match_faces(encodings, known_encodings, known_names)
     except Exception as e:
         print(f"Error recognizing faces: {e}")
         return []
 
 
-def capture_frames(output_folder, frame_queue, interval):
+def recognize_faces_batch(images, known_encodings, known_names):
+    """
+    Recognize faces in several images with one batched pass of the CUDA CNN detector.
+
+    Args:
+        images (list): RGB images of the same size
+        known_encodings (numpy.ndarray): Known face encodings, one per row
+        known_names (list): List of known face names
+
+    Returns:
+        list: List of recognized face names for each image
+    """
+    try:
+        batch_locations = face_recognition.batch_face_locations(
+            images, number_of_times_to_upsample=0, batch_size=len(images)
+        )
+        return [
+            match_faces(face_recognition.face_encodings(image, locations), known_encodings, known_names)
+            for image, locations in zip(images, batch_locations)
+        ]
+    except Exception as e:
+        print(f"Error recognizing faces: {e}")
+        return [[] for _ in images]
+
+
+def match_faces(encodings, known_encodings, known_names):
+    """
+    Names each face encoding after its closest known face.
+
+    Args:
+        encodings (list): Face encodings found in an image
+        known_encodings (numpy.ndarray): Known face encodings, one per row
+        known_names (list): List of known face names
+
+    Returns:
+        list: Recognized name, or "Unknown", for each encoding
+    """
+    recognized_faces = []
+    
+    for encoding in encodings:
+        if len(known_encodings):
+            distances = np.linalg.norm(known_encodings - encoding, axis=1)
+            best_match_index = distances.argmin()
+            if distances[best_match_index] <= FACE_MATCH_TOLERANCE:
+                recognized_faces.append(known_names[best_match_index])
+            else:
+                recognized_faces.append("Unknown")
+        else:
+            recognized_faces.append("Unknown")
+    
+    return recognized_faces
+
+
+def capture_frames(output_folder, frame_queue, interval, save_frames=False,
+                   max_interval=STATIC_SCENE_INTERVAL, show_preview=False, stop_event=None):
     """
     Capture frames from camera at specified intervals.
+    A sampled frame is only queued if the scene changed since the last queued
+    frame, or if max_interval seconds have passed without one.
 
     Args:
         output_folder (str): Directory to save captured frames
-        frame_queue (Queue): Queue to store captured frame data
+        frame_queue (SimpleQueue): Queue to store captured frame data
         interval (int): Interval in seconds between frame captures
+        save_frames (bool): Also archive sampled frames as JPEG files in output_folder
+        max_interval (int): Longest gap in seconds between queued frames in a static scene
+        show_preview (bool): Show the camera feed in a window; pressing 'q' in it stops capturing
+        stop_event (threading.Event): Set to stop capturing (default: run until the camera fails or 'q')
     """
+    stop_event = stop_event or Event()
     try:
-        if not os.path.exists(output_folder):
+        if save_frames and not os.path.exists(output_folder):
             os.makedirs(output_folder)
 
-        cap = cv2.VideoCapture(0)
+        # Shared webcam handle; it stays open after capturing stops
+        cap = get_local_camera()
         if not cap.isOpened():
             print("Error: Could not access the camera.")
             return
@@ -129,28 +300,50 @@ def capture_frames(output_folder, frame_queue, interval):
         frame_count = 0
         fps = cap.get(cv2.CAP_PROP_FPS) or 30
         frame_interval = int(fps * interval)
-
-        print("Starting camera feed. Press 'q' to stop.")
-        while True:
-            ret, frame = cap.read()
+        last_signature = None
+        last_queued = 0.0
+
+        if show_preview:
+            print("Starting camera feed. Press 'q' to stop.")
+        else:
+            print("Starting camera feed. Press Ctrl+C to stop.")
+        while not stop_event.is_set():
+            sampled = frame_count % frame_interval == 0
+            
+            # Grab advances the driver buffer; only frames that are used get decoded
+            ret = cap.grab()
+            if ret and (sampled or show_preview):
+                ret, frame = cap.retrieve()
             if not ret:
                 print("Error: Could not read from camera.")
                 break
 
-            if frame_count % frame_interval == 0:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                frame_filename = os.path.join(output_folder, f"frame_{frame_count}.jpg")
-                cv2.imwrite(frame_filename, frame)
-                frame_queue.put((frame_filename, timestamp))
-                print(f"Captured frame: {frame_filename}")
+            if sampled:
+                # Skip frames showing the same scene as the last one described
+                signature = scene_signature(frame)
+                if (last_signature is None
+                        or cv2.absdiff(last_signature, signature).mean() > SCENE_CHANGE_THRESHOLD
+                        or time.monotonic() - last_queued >= max_interval):
+                    last_signature = signature
+                    last_queued = time.monotonic()
+                    
+                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    if save_frames:
+                        frame_filename = os.path.join(output_folder, f"frame_{frame_count}.jpg")
+                        cv2.imwrite(frame_filename, frame)
+                    # retrieve() returns a fresh array each call, so the frame can be queued as is
+                    frame_queue.put((frame, timestamp))
+                    print(f"Captured frame {frame_count} at {timestamp}")
 
             frame_count += 1
-            cv2.imshow("Camera Feed", frame)
-            if cv2.waitKey(1) & 0xFF == ord('q'):
-                break
-
-        cap.release()
-        cv2.destroyAllWindows()
+            # The preview window costs a GUI refresh per frame, so it is opt-in
+            if show_preview:
+                cv2.imshow("Camera Feed", frame)
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    stop_event.set()
+
+        if show_preview:
+            cv2.destroyAllWindows()
         frame_queue.put(None)  # Signal the end of capturing
         print("Stopped capturing frames.")
         
@@ -158,97 +351,321 @@ def capture_frames(output_folder, frame_queue, interval):
         print(f"Error in frame capture: {e}")
 
 
-def describe_frames(frame_queue, pdf_path, known_encodings, known_names):
+def collect_frame_batch(frame_queue, batch_size=DESCRIBE_BATCH_SIZE, max_wait=DESCRIBE_BATCH_WAIT):
+    """
+    Waits for one frame, then drains up to batch_size frames already buffered in the queue.
+    
+    Args:
+        frame_queue (SimpleQueue): Queue containing captured frame data
+        batch_size (int): Most frames to return (default: 4)
+        max_wait (float): Longest wait in seconds for further frames (default: 0.5)
+    
+    Returns:
+        tuple: (batch, finished) where finished is True once the end signal was seen
+    """
+    batch = []
+    frame_data = frame_queue.get()
+    deadline = time.monotonic() + max_wait
+    while frame_data is not None:
+        batch.append(frame_data)
+        remaining = deadline - time.monotonic()
+        if len(batch) >= batch_size or remaining <= 0:
+            return batch, False
+        try:
+            frame_data = frame_queue.get(timeout=remaining)
+        except Empty:
+            return batch, False
+    return batch, True
+
+
+def make_frame_prompt(timestamp, faces_text):
+    """
+    Builds the description prompt for a single frame.
+    
+    Args:
+        timestamp (str): Capture time of the frame
+        faces_text (str): Names of the faces recognized in the frame
+    
+    Returns:
+        str: Prompt for the generative model
+    """
+    return (
+        f"You are describing a video frame to a blind person. Be as vivid and detailed as possible.\n"
+        f"- Timestamp: {timestamp}\n"
+        f"- Recognized Faces: {faces_text}\n\n"
+        f"Describe the scene in detail."
+    )
+
+
+def make_batch_prompt(frame_details):
+    """
+    Builds one prompt describing several frames, sent alongside the frames in order.
+    
+    Args:
+        frame_details (list): (timestamp, faces_text) for each frame
+    
+    Returns:
+        str: Prompt for the generative model
+    """
+    lines = [
+        f"You are describing {len(frame_details)} video frames to a blind person. "
+        "Be as vivid and detailed as possible.",
+        "The images follow in this order:",
+    ]
+    for number, (timestamp, faces_text) in enumerate(frame_details, start=1):
+        lines.append(f"- Frame {number}: Timestamp: {timestamp}; Recognized Faces: {faces_text}")
+    lines.append(
+        "\nDescribe each scene in detail. Start each description with a line containing only "
+        "'FRAME <number>' and describe the frames in order."
+    )
+    return "\n".join(lines)
+
+
+def split_batch_response(text, count):
+    """
+    Splits a batched response into one description per frame.
+    
+    Args:
+        text (str): Model response for the batch
+        count (int): Number of frames in the batch
+    
+    Returns:
+        list: Descriptions in frame order, or None if the response could not be split
+    """
+    parts = FRAME_HEADING.split(text)
+    # parts = [preamble, number, description, number, description, ...]
+    descriptions = {}
+    for number, description in zip(parts[1::2], parts[2::2]):
+        descriptions[int(number)] = description.strip()
+    if sorted(descriptions) != list(range(1, count + 1)):
+        return None
+    return [descriptions[number] for number in range(1, count + 1)]
+
+
+def describe_frame_batch(batch, known_encodings, known_names):
+    """
+    Describes a batch of frames with a single Gemini call.
+    
+    Args:
+        batch (list): (frame, timestamp) for each frame, frames in BGR order
+        known_encodings (numpy.ndarray): Known face encodings, one per row
+        known_names (list): List of known face names
+    
+    Returns:
+        list: Description text for each frame, in order
+    """
+    # Convert once; both face_recognition and PIL expect RGB
+    rgb_frames = []
+    for frame, timestamp in batch:
+        print(f"Processing frame captured at {timestamp}")
+        rgb_frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    
+    # Recognize faces in the frames, all at once when a GPU is available
+    if USE_CUDA:
+        faces_per_frame = recognize_faces_batch(rgb_frames, known_encodings, known_names)
+    else:
+        faces_per_frame = [recognize_faces(rgb_frame, known_encodings, known_names) for rgb_frame in rgb_frames]
+    
+    frame_details = []
+    images = []
+    for (_, timestamp), recognized_faces, rgb_frame in zip(batch, faces_per_frame, rgb_frames):
+        faces_text = ", ".join(recognized_faces) if recognized_faces else "No faces recognized"
+        frame_details.append((timestamp, faces_text))
+        images.append(Image.fromarray(rgb_frame))
+    
+    try:
+        if len(batch) > 1:
+            # One call for the whole batch amortizes the per-request overhead
+            response = MODEL.generate_content([make_batch_prompt(frame_details)] + images)
+            descriptions = split_batch_response(response.text, len(batch))
+            if descriptions is not None:
+                return [replace_special_characters(text) for text in descriptions]
+            print("Could not split batched description, describing frames one by one.")
+        
+        descriptions = []
+        for (timestamp, faces_text), image in zip(frame_details, images):
+            response = MODEL.generate_content([make_frame_prompt(timestamp, faces_text), image])
+            descriptions.append(replace_special_characters(response.text))
+        return descriptions
+    except Exception as e:
+        print(f"Error generating description: {e}")
+        return ["Error generating description."] * len(batch)
+
+
+def describe_frames(frame_queue, pdf_path, known_encodings, known_names, executor=None,
+                    workers=DESCRIBE_WORKERS):
     """
     Generate descriptions for captured frames and save to PDF.
 
     Args:
-        frame_queue (Queue): Queue containing captured frame data
+        frame_queue (SimpleQueue): Queue containing captured frame data
         pdf_path (str): Path to save the output PDF
-        known_encodings (list): List of known face encodings
+        known_encodings (numpy.ndarray): Known face encodings, one per row
         known_names (list): List of known face names
+        executor (ThreadPoolExecutor): Worker pool to describe batches on (default: a temporary one)
+        workers (int): Batches described concurrently; should match the executor's worker count (default: 4)
     """
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ThreadPoolExecutor(max_workers=workers)
     try:
-        pdf = FPDF()
+        # Futures in submission order, so pages follow capture order
+        pending = []
+        # One batch per worker in flight; while all are busy, new frames wait in the queue
+        in_flight = Semaphore(workers)
         
-        while True:
-            frame_data = frame_queue.get()
-            if frame_data is None:  # End signal
-                break
-
-            frame_path, timestamp = frame_data
-            print(f"Processing frame: {frame_path}")
+        finished = False
+        while not finished:
+            # Describe whatever frames have built up together
+            batch, finished = collect_frame_batch(frame_queue)
+            if not batch:
+                continue
             
-            # Recognize faces in the frame
-            recognized_faces = recognize_faces(frame_path, known_encodings, known_names)
-            faces_text = ", ".join(recognized_faces) if recognized_faces else "No faces recognized"
-
-            # Prepare the prompt
-            prompt = (
-                f"You are describing a video frame to a blind person. Be as vivid and detailed as possible.\n"
-                f"- Timestamp: {timestamp}\n"
-                f"- Recognized Faces: {faces_text}\n\n"
-                f"Describe the scene in detail."
-            )
-
+            in_flight.acquire()
+            future = executor.submit(describe_frame_batch, batch, known_encodings, known_names)
+            future.add_done_callback(lambda _: in_flight.release())
+            pending.append((future, len(batch)))
+        
+        # Gather every description, then build the PDF in one pass at the end
+        descriptions = []
+        for future, count in pending:
             try:
-                # Open the image using PIL
-                image = Image.open(frame_path)
-
-                # Pass the text and image to the generative model
-                response = model.generate_content([prompt, image])
-
-                # Process the API response
-                description_text = replace_special_characters(response.text)
+                descriptions.extend(future.result())
             except Exception as e:
                 print(f"Error generating description: {e}")
-                description_text = "Error generating description."
-
-            # Add the description to the PDF
+                descriptions.extend(["Error generating description."] * count)
+        
+        # Add one page per description, then save the PDF
+        pdf = FPDF()
+        pdf.set_font("Arial", size=12)
+        for description_text in descriptions:
             pdf.add_page()
-            pdf.set_font("Arial", size=12)
             pdf.multi_cell(0, 10, description_text)
-
-        # Save the PDF
         pdf.output(pdf_path)
         print(f"Descriptions saved to PDF: {pdf_path}")
         
     except Exception as e:
         print(f"Error in frame description: {e}")
+    finally:
+        if owns_executor:
+            executor.shutdown(wait=False)
 
 
-def start_video_analysis(output_folder="frames", output_pdf="descriptions.pdf", 
-                        interval=6, known_faces_dir=None):
+class VideoAnalyzer:
     """
-    Start the video analysis process with frame capture and description generation.
-
-    Args:
-        output_folder (str): Directory to save captured frames
-        output_pdf (str): Path to save the output PDF
-        interval (int): Interval in seconds between frame captures
-        known_faces_dir (str): Directory containing known face images
+    Reusable video analysis pipeline.
+    The description worker pool lives as long as the analyzer, so repeated
+    sessions do not rebuild it.
     """
-    try:
+
+    def __init__(self, known_faces_dir=None, workers=DESCRIBE_WORKERS):
+        """
+        Creates the analyzer and its description worker pool.
+
+        Args:
+            known_faces_dir (str): Directory containing known face images
+            workers (int): Batches described concurrently (default: 4)
+        """
+        self.known_faces_dir = known_faces_dir
+        self.workers = workers
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.known_encodings = np.empty((0, FACE_ENCODING_SIZE), dtype=np.float32)
+        self.known_names = []
+
+    def reload_known_faces(self):
+        """
+        Refreshes the known faces; cheap while the .npz encoding cache is current.
+        """
+        if self.known_faces_dir and os.path.exists(self.known_faces_dir):
+            self.known_encodings, self.known_names = load_known_faces(self.known_faces_dir)
+
+    def run(self, output_folder="frames", output_pdf="descriptions.pdf", interval=6,
+            save_frames=False, show_preview=False):
+        """
+        Runs one capture and description session until capturing stops.
+
+        Args:
+            output_folder (str): Directory to save captured frames
+            output_pdf (str): Path to save the output PDF
+            interval (int): Interval in seconds between frame captures
+            save_frames (bool): Also archive sampled frames as JPEG files in output_folder
+            show_preview (bool): Show the camera feed in a window; pressing 'q' in it stops the analysis
+        """
         # Set up threading
-        frame_queue = Queue()
+        # SimpleQueue is implemented in C and skips Queue's task-tracking locks
+        frame_queue = SimpleQueue()
+        stop_event = Event()
         
-        # Load known faces if directory is provided
-        known_encodings, known_names = [], []
-        if known_faces_dir and os.path.exists(known_faces_dir):
-            known_encodings, known_names = load_known_faces(known_faces_dir)
+        # Pick up faces registered since the last session
+        self.reload_known_faces()
 
         # Create and start threads
-        capture_thread = Thread(target=capture_frames, args=(output_folder, frame_queue, interval))
-        describe_thread = Thread(target=describe_frames, args=(frame_queue, output_pdf, known_encodings, known_names))
+        capture_thread = Thread(target=capture_frames, args=(output_folder, frame_queue, interval, save_frames),
+                                kwargs={"show_preview": show_preview, "stop_event": stop_event})
+        describe_thread = Thread(target=describe_frames,
+                                 args=(frame_queue, output_pdf, self.known_encodings, self.known_names),
+                                 kwargs={"executor": self.pool, "workers": self.workers})
 
         # Start threads
         capture_thread.start()
         describe_thread.start()
 
-        # Wait for threads to complete
-        capture_thread.join()
+        # Wait for threads to complete; Ctrl+C stops capturing and finishes the descriptions
+        try:
+            while capture_thread.is_alive():
+                capture_thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            print("Stopping frame capture...")
+            stop_event.set()
+            capture_thread.join()
         describe_thread.join()
 
+    def close(self):
+        """
+        Shuts down the description worker pool.
+        """
+        self.pool.shutdown(wait=True)
+
+
+# Analyzer shared by start_video_analysis calls, created on first use
+_ANALYZER = None
+
+
+def get_video_analyzer(known_faces_dir=None):
+    """
+    Returns the shared video analyzer, replacing it if the known faces directory changed.
+
+    Args:
+        known_faces_dir (str): Directory containing known face images
+
+    Returns:
+        VideoAnalyzer: Shared analyzer
+    """
+    global _ANALYZER
+    if _ANALYZER is None or _ANALYZER.known_faces_dir != known_faces_dir:
+        if _ANALYZER is not None:
+            _ANALYZER.close()
+        _ANALYZER = VideoAnalyzer(known_faces_dir)
+    return _ANALYZER
+
+
+def start_video_analysis(output_folder="frames", output_pdf="descriptions.pdf", 
+                        interval=6, known_faces_dir=None, save_frames=False, show_preview=False):
+    """
+    Start the video analysis process with frame capture and description generation.
+
+    Args:
+        output_folder (str): Directory to save captured frames
+        output_pdf (str): Path to save the output PDF
+        interval (int): Interval in seconds between frame captures
+        known_faces_dir (str): Directory containing known face images
+        save_frames (bool): Also archive sampled frames as JPEG files in output_folder
+        show_preview (bool): Show the camera feed in a window; pressing 'q' in it stops the analysis
+    """
+    try:
+        get_video_analyzer(known_faces_dir).run(output_folder, output_pdf, interval,
+                                                save_frames=save_frames, show_preview=show_preview)
+
         print("Frame capturing and description completed.")
         
     except Exception as e:
@@ -265,7 +682,7 @@ def get_video_analysis_stats():
     try:
         stats = {
             'output_folders': [],
-            'known_faces_loaded': 0,
+            'known_faces_loaded': len(_ANALYZER.known_names) if _ANALYZER else 0,
             'model_configured': bool(GEMINI_API_KEY)
         }
         
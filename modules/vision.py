@@ -0,0 +1,127 @@
+"""
+Vision Module
+Shared capture-and-ask helper used by every Gemini vision feature.
+"""
+
+import io
+from dataclasses import dataclass
+from typing import Any, Optional
+import google.generativeai as genai
+from modules.gemini_client import MODEL
+from modules.iot_controller import get_frame_jpeg, aim_camera
+
+# MIME type of the frames returned by get_frame_jpeg
+FRAME_MIME_TYPE = "image/jpeg"
+
+
+@dataclass(slots=True)
+class CapturedFrame:
+    """
+    A captured JPEG frame shared across several prompts.
+    The bytes are uploaded to the Gemini Files API on first use and the
+    same file handle is sent with every later prompt.
+    """
+    
+    jpeg_bytes: bytes
+    uploaded: Optional[Any] = None
+    
+    def as_part(self):
+        """
+        Returns the content part to send to Gemini for this frame.
+        
+        Returns:
+            File handle once uploaded, or an inline image part if the upload failed
+        """
+        if self.uploaded is None:
+            try:
+                self.uploaded = genai.upload_file(io.BytesIO(self.jpeg_bytes), mime_type=FRAME_MIME_TYPE)
+            except Exception as e:
+                print(f"Frame upload failed, sending it inline: {e}")
+                return {"mime_type": FRAME_MIME_TYPE, "data": self.jpeg_bytes}
+        return self.uploaded
+    
+    def release(self):
+        """
+        Deletes the uploaded copy of the frame, if any.
+        """
+        if self.uploaded is None:
+            return
+        try:
+            genai.delete_file(self.uploaded.name)
+        except Exception as e:
+            print(f"Error deleting uploaded frame: {e}")
+        self.uploaded = None
+
+
+def capture_jpeg(servo_angle=None):
+    """
+    Optionally aims the camera, then captures the current view as JPEG bytes.
+    
+    Args:
+        servo_angle (int): Servo angle to move to before capturing (default: leave as is)
+    
+    Returns:
+        bytes: JPEG-encoded frame or None if the frame could not be fetched
+    """
+    # Set servo to the requested viewing angle and let it settle
+    if servo_angle is not None:
+        aim_camera(servo_angle)
+    
+    # Fetch the frame as JPEG bytes, passed to Gemini without re-encoding
+    frame_bytes, _ = get_frame_jpeg()
+    
+    if frame_bytes is None:
+        print("Error: Could not fetch frame from camera.")
+        return None
+    
+    return frame_bytes
+
+
+def capture_frame(servo_angle=None):
+    """
+    Captures a frame to be reused across several prompts in one session.
+    Call release() on the result when the session ends.
+    
+    Args:
+        servo_angle (int): Servo angle to move to before capturing (default: leave as is)
+    
+    Returns:
+        CapturedFrame: Captured frame or None if the frame could not be fetched
+    """
+    frame_bytes = capture_jpeg(servo_angle)
+    if frame_bytes is None:
+        return None
+    return CapturedFrame(jpeg_bytes=frame_bytes)
+
+
+def ask_gemini(prompt, servo_angle=None, frame_bytes=None, frame=None):
+    """
+    Sends a camera frame and a prompt to the shared Gemini vision model.
+    
+    Args:
+        prompt (str): Instruction for the model
+        servo_angle (int): Servo angle to capture from (default: leave as is)
+        frame_bytes (bytes): Previously captured JPEG frame (default: capture a new one)
+        frame (CapturedFrame): Session frame shared across prompts, takes precedence over frame_bytes
+    
+    Returns:
+        str: Model response text or None if capture or generation failed
+    """
+    try:
+        if frame is not None:
+            image = frame.as_part()
+        else:
+            # Capture a fresh frame unless the caller already has one
+            if frame_bytes is None:
+                frame_bytes = capture_jpeg(servo_angle)
+                if frame_bytes is None:
+                    return None
+            image = {"mime_type": FRAME_MIME_TYPE, "data": frame_bytes}
+        
+        # Use the shared generative model to generate the response
+        response = MODEL.generate_content([image, prompt])
+        return response.text
+    
+    except Exception as e:
+        print(f"An error occurred while querying the vision model: {e}")
+        return None